@@ -0,0 +1,95 @@
+import sys
+import time
+
+import numpy as np
+
+import r_critical
+from r_critical import calculate_r_critical, calculate_r_critical_batch, calculate_r_critical_log
+
+# Times the critical-r paths against the old ppf(1 - alpha/2) formulation,
+# over alphas from 1e-2 down to 1e-300 and over ordinary alphas (1e-8 to 0.1),
+# and shows what the old path returns for each. A single scalar call is timed
+# too, where per-call overhead rather than the arithmetic dominates.
+#
+#   python benchmark_tiny_alpha.py [n_values] [repeats]
+
+ALPHA_RANGES = {"tiny": (1e-300, 1e-2), "ordinary": (1e-8, 0.1)}
+
+
+def _best_of(repeats, func):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _run(alpha, n, repeats):
+    log_alpha = np.log(alpha)
+    df = n - 2.0
+    timings = {
+        "calculate_r_critical_batch (alpha)": lambda: calculate_r_critical_batch(alpha, n)[0],
+        "calculate_r_critical_log (log alpha)": lambda: calculate_r_critical_log(log_alpha, n)[0],
+    }
+    try:
+        from scipy.stats import t
+    except ImportError:
+        t = None
+    if t is not None:
+        def ppf_path():
+            t_crit = t.ppf(1 - alpha / 2, df)
+            with np.errstate(over="ignore", invalid="ignore"):
+                return t_crit / np.sqrt(t_crit**2 + df)
+
+        def isf_path():
+            previous = r_critical.get_t_backend()
+            r_critical.set_t_backend("scipy")
+            try:
+                return calculate_r_critical_batch(alpha, n)[0]
+            finally:
+                r_critical.set_t_backend(previous)
+
+        timings["scipy t.ppf(1 - alpha/2) (old path)"] = ppf_path
+        timings["scipy t.isf(alpha/2) backend"] = isf_path
+
+    reference = None
+    for name, func in timings.items():
+        elapsed, r_crit = _best_of(repeats, func)
+        if reference is None:
+            reference = r_crit
+        wrong = np.count_nonzero(~np.isclose(r_crit, reference, rtol=1e-9, atol=0))
+        print(f"  {name:40s} {elapsed * 1e3:9.1f} ms  {wrong:6d} values off by > 1e-9")
+
+
+def _run_scalar(repeats, calls=1000):
+    timings = {"calculate_r_critical(0.05, 14)": lambda: calculate_r_critical(0.05, 14)[0]}
+    try:
+        from scipy.stats import t
+    except ImportError:
+        t = None
+    if t is not None:
+        def ppf_path():
+            t_crit = t.ppf(1 - 0.05 / 2, 12)
+            return t_crit / np.sqrt(t_crit**2 + 12)
+
+        timings["scipy t.ppf(1 - alpha/2) (old path)"] = ppf_path
+    print(f"one critical value, {calls} calls")
+    for name, func in timings.items():
+        elapsed, _ = _best_of(repeats, lambda: [func() for _ in range(calls)])
+        print(f"  {name:40s} {elapsed / calls * 1e6:9.1f} us per call")
+
+
+def benchmark(size=100_000, repeats=3, seed=0):
+    rng = np.random.default_rng(seed)
+    n = rng.integers(3, 1_000_000, size)
+    for label, (low, high) in ALPHA_RANGES.items():
+        alpha = np.exp(rng.uniform(np.log(low), np.log(high), size))
+        print(f"{size} critical values, {label} alpha in [{low:g}, {high:g}], n in [3, 1e6]")
+        _run(alpha, n, repeats)
+    _run_scalar(repeats)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    benchmark(*args)
@@ -0,0 +1,108 @@
+import math
+import os
+import sys
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+import r_critical
+from r_table import STANDARD_ALPHAS, TAIL_TYPES
+
+# Fits r_crit(n) for the standard alphas with Chebyshev series and writes the
+# coefficients to r_approx_coeffs.py, which r_approx.py evaluates at runtime.
+#
+#   u = 1 / df,  h(u) = r_crit * sqrt(df) = t / sqrt(t^2 u + 1),  r_crit = h(u) sqrt(u)
+#
+# h is smooth on [0, 1/(N_MIN - 2)] and tends to the normal quantile as
+# u -> 0, so a short series covers every n >= N_MIN. n below N_MIN is stored
+# exactly. Run with: python build_r_approx.py
+
+N_MIN = 5
+TARGET_ERROR = 1e-13
+# The stored bound is the largest error seen on the check points plus this
+# fraction, rounded up, so it also covers the n between check points
+ERROR_MARGIN = 0.1
+MAX_DEGREE = 60
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "r_approx_coeffs.py")
+
+
+def _reference(alpha, n, tail_type):
+    return r_critical.calculate_r_critical_batch(alpha, n, tail_type)[0]
+
+
+def _h(u, alpha, tail_type):
+    df = 1 / u
+    _, t_crit, _ = r_critical.calculate_r_critical_batch(alpha, df + 2, tail_type)
+    return t_crit / np.sqrt(t_crit * t_crit * u + 1)
+
+
+def _check_points():
+    # Every n up to 50000, then a dense log grid out to 1e12
+    return np.unique(np.concatenate([np.arange(N_MIN, 50001), np.logspace(4.6, 12, 20000)]))
+
+
+def _round_up(value, digits=3):
+    # value rounded up (never down) to `digits` significant digits, as a literal
+    exponent = math.floor(math.log10(value)) - digits + 1
+    mantissa = str(math.ceil(value / 10.0**exponent))
+    return f"{mantissa[0]}.{mantissa[1:]}e{exponent + len(mantissa) - 1}"
+
+
+def fit(alpha, tail_type):
+    """Return (coeffs, bound) for the lowest degree whose bound meets TARGET_ERROR.
+
+    bound is the max error on the check points plus ERROR_MARGIN, rounded
+    up, as a float literal.
+    """
+    u_max = 1 / (N_MIN - 2)
+    n = _check_points()
+    df = n - 2
+    expected = _reference(alpha, n, tail_type)
+    x = 2 * (1 / df) / u_max - 1
+    for degree in range(4, MAX_DEGREE + 1):
+        nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+        coeffs = chebyshev.chebfit(nodes, _h((nodes + 1) / 2 * u_max, alpha, tail_type), degree)
+        error = np.max(np.abs(chebyshev.chebval(x, coeffs) / np.sqrt(df) - expected))
+        bound = _round_up(error * (1 + ERROR_MARGIN))
+        if float(bound) <= TARGET_ERROR:
+            break
+    return coeffs, bound
+
+
+def main():
+    # Take reference values from scipy when it is installed
+    try:
+        import scipy.stats  # noqa: F401
+        r_critical.set_t_backend("scipy")
+    except ImportError:
+        pass
+
+    lines = [
+        "# Generated by build_r_approx.py -- do not edit by hand.",
+        f"# Reference t quantiles from the {r_critical.get_t_backend()} backend.",
+        f"N_MIN = {N_MIN}",
+        "",
+        "# (tail_type, alpha): (bound on |r_crit error| for n >= N_MIN,",
+        "#                      exact r_crit for n = 3..N_MIN-1, Chebyshev coefficients)",
+        "FITS = {",
+    ]
+    for tail_type in TAIL_TYPES:
+        for alpha in STANDARD_ALPHAS:
+            coeffs, bound = fit(alpha, tail_type)
+            small = _reference(alpha, np.arange(3, N_MIN), tail_type)
+            print(f"{tail_type} alpha={alpha}: degree {len(coeffs) - 1}, error bound {bound}")
+            lines.append(f"    ({tail_type!r}, {alpha!r}): (")
+            lines.append(f"        {bound},")
+            lines.append(f"        ({', '.join(repr(float(v)) for v in small)},),")
+            lines.append("        (")
+            lines.extend(f"            {float(c)!r}," for c in coeffs)
+            lines.append("        ),")
+            lines.append("    ),")
+    lines.append("}")
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"Wrote {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
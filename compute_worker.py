@@ -0,0 +1,161 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Background jobs for the Tk app. Work runs on a thread (or process) pool and
+# never touches Tk; finished results and progress reports go into a
+# queue.Queue that the Tk main loop drains with widget.after(), so every
+# callback runs on the main thread.
+#
+# Jobs are submitted on a named channel ("plot", "power", ...). Each
+# submission gets a new generation id and supersedes the channel's previous
+# job: that job is asked to stop, and anything it still reports is dropped.
+
+POOLS = ("thread", "process")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job by Job.check() once the job has been superseded or cancelled."""
+
+
+class Job:
+    """Handle passed to thread-pool jobs for progress reports and cancellation."""
+
+    def __init__(self, channel, generation, messages):
+        self.channel = channel
+        self.generation = generation
+        self._messages = messages
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Raise JobCancelled if the job should stop; call between work chunks."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, fraction):
+        """Report progress as a fraction in [0, 1]; shown via on_progress."""
+        self._messages.put(("progress", self.channel, self.generation, fraction))
+
+
+class BackgroundWorker:
+    """Run jobs off the Tk main loop and hand results back on it.
+
+    With pool="thread" (default) job functions are called as
+    func(*args, job=Job) and can report progress and stop early. With
+    pool="process" they are called as func(*args), must be picklable, and
+    cancelling only drops their result (or skips them if not started yet).
+    """
+
+    def __init__(self, widget, pool="thread", max_workers=None, poll_ms=30):
+        if pool not in POOLS:
+            raise ValueError(f"Unknown pool {pool!r}, expected one of {POOLS}.")
+        self.widget = widget
+        self.pool = pool
+        self.poll_ms = poll_ms
+        executor = ThreadPoolExecutor if pool == "thread" else ProcessPoolExecutor
+        self._executor = executor(max_workers=max_workers)
+        self._messages = queue.Queue()
+        self._ids = itertools.count(1)
+        self._current = {}  # channel -> (generation, future, job, callbacks)
+        self._poll_job = None
+
+    def submit(self, channel, func, *args, on_result, on_error=None, on_progress=None):
+        """Start func(*args) for channel, superseding its previous job.
+
+        on_result(value), on_error(exception) and on_progress(fraction) are
+        called on the Tk main loop, and only for the channel's latest job.
+        An exception raised by on_result or on_progress is passed to
+        on_error. Returns the job's generation id.
+        """
+        self.cancel(channel)
+        generation = next(self._ids)
+        if self.pool == "thread":
+            job = Job(channel, generation, self._messages)
+            future = self._executor.submit(func, *args, job=job)
+        else:
+            job = None
+            future = self._executor.submit(func, *args)
+        self._current[channel] = (generation, future, job, (on_result, on_error, on_progress))
+        # Runs on the worker thread (or the pool's result thread): only queue it
+        future.add_done_callback(lambda f: self._messages.put(("done", channel, generation, f)))
+        self._schedule_poll()
+        return generation
+
+    def busy(self, channel):
+        return channel in self._current
+
+    def cancel(self, channel):
+        """Stop the channel's current job, if any, and discard whatever it still reports."""
+        current = self._current.pop(channel, None)
+        if current is None:
+            return
+        _, future, job, _ = current
+        future.cancel()
+        if job is not None:
+            job.cancel()
+
+    def shutdown(self):
+        for channel in list(self._current):
+            self.cancel(channel)
+        if self._poll_job is not None:
+            self.widget.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        try:
+            self._drain()
+        finally:
+            if self._current:
+                self._schedule_poll()
+
+    def _drain(self):
+        while True:
+            try:
+                kind, channel, generation, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            current = self._current.get(channel)
+            if current is None or current[0] != generation:
+                continue  # superseded or cancelled
+            on_result, on_error, on_progress = current[3]
+            if kind == "progress":
+                if on_progress is not None:
+                    self._call(on_progress, payload, on_error)
+                continue
+            del self._current[channel]
+            if payload.cancelled():
+                continue
+            error = payload.exception()
+            if error is None:
+                self._call(on_result, payload.result(), on_error)
+            elif not isinstance(error, JobCancelled) and on_error is not None:
+                self._call(on_error, error, None)
+
+    def _call(self, callback, value, on_error):
+        # A callback that raises (e.g. a plotting error in on_result) goes to
+        # on_error, or to Tk's report_callback_exception, and the queue keeps
+        # draining for the other channels
+        try:
+            callback(value)
+        except Exception as error:
+            if on_error is not None:
+                try:
+                    on_error(error)
+                    return
+                except Exception as nested:
+                    error = nested
+            self.widget._root().report_callback_exception(type(error), error, error.__traceback__)
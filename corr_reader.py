@@ -0,0 +1,129 @@
+import csv
+import itertools
+import os
+import sys
+
+import numpy as np
+
+from streaming_corr import OnlineCorrelation
+
+# Correlation of two columns of a data file that may be far larger than RAM.
+# Readers yield (rows x 2) float64 chunks: CSV files are parsed a block of
+# lines at a time, .npy files and headerless raw binary files are
+# memory-mapped and sliced. The chunks feed an OnlineCorrelation, so only its
+# running sums are ever kept, and the result is tested against r_critical.
+#
+#   python corr_reader.py [--no-header] data.csv x_column y_column [alpha] [1-tailed|2-tailed]
+#
+# With --no-header the first CSV line is data and the columns are 0-based
+# indices.
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def _column_index(column, names):
+    if isinstance(column, int):
+        return column
+    if names is None:
+        raise ValueError(f"Column {column!r} given by name but the file has no header.")
+    if column not in names:
+        raise ValueError(f"Column {column!r} not found; available: {', '.join(names)}")
+    return names.index(column)
+
+
+def iter_csv_chunks(path, columns, chunk_rows=DEFAULT_CHUNK_ROWS, delimiter=",", header=True):
+    """Yield float64 arrays of the requested columns, chunk_rows lines at a time.
+
+    Columns are names (needs a header line) or 0-based indices. Blank or
+    unparsable fields become NaN.
+    """
+    # utf-8-sig drops the byte-order mark of Excel's "CSV UTF-8" export, which
+    # would otherwise stick to the first column name
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        names = None
+        if header:
+            names = [name.strip() for name in next(csv.reader([f.readline()], delimiter=delimiter))]
+        usecols = [_column_index(c, names) for c in columns]
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            try:
+                # Fast C parser; falls back to field-by-field parsing for
+                # chunks with blanks or text in them
+                chunk = np.loadtxt(lines, delimiter=delimiter, usecols=usecols, ndmin=2, dtype=np.float64)
+            except ValueError:
+                rows = csv.reader(lines, delimiter=delimiter)
+                chunk = np.array([[_to_float(row, i) for i in usecols] for row in rows if row], dtype=np.float64)
+            if chunk.size:
+                yield chunk.reshape(-1, len(usecols))
+
+
+def _to_float(row, i):
+    try:
+        return float(row[i])
+    except (IndexError, ValueError):
+        return np.nan
+
+
+def iter_npy_chunks(path, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield chunks of the given columns of a 2-D .npy file via a memory map."""
+    data = np.load(path, mmap_mode="r")
+    if data.ndim != 2:
+        raise ValueError("Expected a 2-D array in the .npy file.")
+    return _iter_mapped(data, columns, chunk_rows)
+
+
+def iter_raw_chunks(path, n_columns, columns, dtype="<f8", chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield chunks from a headerless row-major binary file of n_columns values per row."""
+    itemsize = np.dtype(dtype).itemsize
+    n_rows = os.path.getsize(path) // (itemsize * n_columns)
+    data = np.memmap(path, dtype=dtype, mode="r", shape=(n_rows, n_columns))
+    return _iter_mapped(data, columns, chunk_rows)
+
+
+def _iter_mapped(data, columns, chunk_rows):
+    for start in range(0, data.shape[0], chunk_rows):
+        yield np.asarray(data[start:start + chunk_rows, list(columns)], dtype=np.float64)
+
+
+def correlate_file(path, x_column, y_column, alpha=0.05, tail_type="2-tailed",
+                   chunk_rows=DEFAULT_CHUNK_ROWS, n_columns=None, dtype="<f8", delimiter=",", header=True):
+    """Correlation of two columns of a CSV, .npy or raw binary file.
+
+    The format follows the extension (.csv/.txt, .npy, anything else is raw
+    binary and needs n_columns). header says whether a CSV starts with a
+    line of column names; without one, columns must be 0-based indices.
+    Rows where either value is missing or not finite are skipped. Returns streaming_corr.CorrelationStatus.
+    """
+    columns = (x_column, y_column)
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".txt"):
+        chunks = iter_csv_chunks(path, columns, chunk_rows, delimiter, header)
+    elif ext == ".npy":
+        chunks = iter_npy_chunks(path, columns, chunk_rows)
+    else:
+        if n_columns is None:
+            raise ValueError("Raw binary files need n_columns.")
+        chunks = iter_raw_chunks(path, n_columns, columns, dtype, chunk_rows)
+
+    acc = OnlineCorrelation(alpha, tail_type)
+    for chunk in chunks:
+        keep = np.isfinite(chunk).all(axis=1)
+        acc.update_chunk(chunk[keep, 0], chunk[keep, 1])
+    return acc.status()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    header = "--no-header" not in args
+    args = [a for a in args if a != "--no-header"]
+    if len(args) < 3:
+        sys.exit("usage: python corr_reader.py [--no-header] FILE X_COLUMN Y_COLUMN [ALPHA] [1-tailed|2-tailed]")
+    path, x_col, y_col = args[:3]
+    if path.lower().endswith(".npy") or not header:
+        x_col, y_col = int(x_col), int(y_col)
+    alpha = float(args[3]) if len(args) > 3 else 0.05
+    tail_type = args[4] if len(args) > 4 else "2-tailed"
+    status = correlate_file(path, x_col, y_col, alpha, tail_type, header=header)
+    print(f"n = {status.n}\nr = {status.r:.6f}\nr_critical = {status.r_crit}\nsignificant: {status.significant}")
@@ -0,0 +1,81 @@
+from collections import namedtuple
+
+import numpy as np
+
+from r_critical import calculate_r_critical, p_value
+
+# All-pairs Pearson correlation scan for wide (n_samples x n_features) data.
+# Columns are standardized once; the correlation matrix is then produced one
+# (block_size x block_size) tile at a time as a matrix product, compared with
+# the single r_critical for this n, and only the significant pairs are kept.
+# Memory is the standardized data plus one tile, whatever the feature count.
+
+# Sparse COO result: feature indices i < j, their correlation r and p-value,
+# plus the sample size and threshold used.
+SignificantPairs = namedtuple("SignificantPairs", "i j r p n r_crit")
+
+DEFAULT_BLOCK_SIZE = 1024
+
+
+def standardize(data, out=None):
+    """Center each column and scale it to unit length, so Z.T @ Z is the
+    correlation matrix. Constant columns become all zeros (never significant).
+
+    out, a float64 array of data's shape (e.g. a view of shared memory),
+    receives the result directly, so no other copy of the matrix is made."""
+    data = np.asarray(data)
+    if data.ndim != 2:
+        raise ValueError("Data must be a 2-D (n_samples x n_features) array.")
+    if out is None:
+        out = np.empty(data.shape, dtype=np.float64)
+    np.subtract(data, data.mean(axis=0, dtype=np.float64), out=out)
+    norms = np.sqrt(np.einsum("ij,ij->j", out, out))
+    out /= np.where(norms > 0, norms, 1.0)
+    return out
+
+
+def tile_blocks(n_features, block_size=DEFAULT_BLOCK_SIZE):
+    """(i0, i1, j0, j1) for every tile on or above the block diagonal."""
+    starts = range(0, n_features, block_size)
+    return [(i0, min(i0 + block_size, n_features), j0, min(j0 + block_size, n_features))
+            for i0 in starts for j0 in starts if j0 >= i0]
+
+
+def scan_tile(z, i0, i1, j0, j1, r_crit):
+    """Significant pairs (i, j, r) with i < j inside one tile of Z.T @ Z."""
+    r = z[:, i0:i1].T @ z[:, j0:j1]
+    np.clip(r, -1.0, 1.0, out=r)
+    hit = np.abs(r) >= r_crit
+    if i0 == j0:
+        hit &= np.triu(np.ones(hit.shape, dtype=bool), k=1)
+    ii, jj = np.nonzero(hit)
+    return ii + i0, jj + j0, r[ii, jj]
+
+
+def merge_tiles(parts, n, r_crit, tail_type="2-tailed"):
+    """Concatenate per-tile (i, j, r) results and attach p-values."""
+    parts = list(parts)
+    if parts:
+        i = np.concatenate([p[0] for p in parts]).astype(np.int64)
+        j = np.concatenate([p[1] for p in parts]).astype(np.int64)
+        r = np.concatenate([p[2] for p in parts])
+    else:
+        i = j = np.empty(0, dtype=np.int64)
+        r = np.empty(0)
+    order = np.lexsort((j, i))
+    i, j, r = i[order], j[order], r[order]
+    p = p_value(r, n, tail_type) if r.size else np.empty(0)
+    return SignificantPairs(i, j, r, p, n, r_crit)
+
+
+def scan_significant_pairs(data, alpha=0.05, tail_type="2-tailed", block_size=DEFAULT_BLOCK_SIZE):
+    """Test every pair of columns of data against r_critical(alpha, n).
+
+    Returns SignificantPairs with the pairs where |r| >= r_crit, sorted by
+    (i, j).
+    """
+    z = standardize(data)
+    n, n_features = z.shape
+    r_crit, _, _ = calculate_r_critical(alpha, n, tail_type)
+    parts = (scan_tile(z, *tile, r_crit) for tile in tile_blocks(n_features, block_size))
+    return merge_tiles(parts, n, r_crit, tail_type)
@@ -1,57 +1,120 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import matplotlib.pyplot as plt
-from scipy.stats import t
 import numpy as np
 import matplotlib
-
-def calculate_r_critical(alpha, n, tail_type="2-tailed"):
-    df = n - 2
-    if df <= 0:
-        raise ValueError("Sample size must be at least 3.")
+from r_critical import cached_r_critical, r_null_pdf
+from power import power
+from r_table import load_table
+from t_dist import t_pdf
+from plot_controller import CriticalRegionPlot, PdfCurveCache, region_slice
+from live_update import Debounce, FrameThrottle
+from compute_worker import BackgroundWorker
+
+# Memory-map the precomputed table if it has been built (python r_table.py)
+critical_table = load_table()
+if critical_table is not None:
+    cached_r_critical.set_compute(critical_table.lookup)
+t_pdf_cache = PdfCurveCache(t_pdf)
+
+# Fixed y range for the t view, so successive updates can be blitted
+T_VIEW_YLIM = (0, 0.42)
+# Arguments of the t plot on screen, so zoom/pan can resample it; empty
+# while another view is shown
+t_view = {}
+
+def default_t_range(t_critical):
+    # -5..5, doubled as often as needed to keep the critical values (+ some
+    # tail) on screen. Snapping to 5 * 2^k keeps the range, and so the cached
+    # curve, the same for every alpha whose |t_critical| falls in one octave
+    half_width = 5.0
+    if 1.25 * abs(t_critical) > half_width:
+        half_width *= 2.0 ** np.ceil(np.log2(1.25 * abs(t_critical) / half_width))
+    return (-half_width, half_width)
+
+def plot_t_distribution(alpha, df, tail_type, t_critical, xlim=None):
+    # Samples the curve at (at least) one point per screen pixel over xlim (the
+    # adaptive default range, or the zoomed/panned view when resampling).
+    # Curves are cached per df and range; the critical regions are slices of them.
+    keep_view = xlim is not None
+    if xlim is None:
+        xlim = default_t_range(t_critical)
+    x_min, x_max = xlim
+    points = max(1000, region_plot.pixel_width())
+    x_vals, y_vals = t_pdf_cache.curve(df, x_min, x_max, points)
+    labels = {"curve": 't-distribution'}
+
+    right = region_slice(x_vals, y_vals, t_critical, x_max)
+    if tail_type == "1-tailed":
+        left = None
+        labels["right"] = f'Critical region (α = {alpha})'
+        labels["right_line"] = f't_critical = {t_critical:.3f}'
+    else:
+        left = region_slice(x_vals, y_vals, x_min, -t_critical)
+        labels["right"] = f'Right critical region (α/2 = {alpha/2})'
+        labels["left"] = f'Left critical region (α/2 = {alpha/2})'
+        labels["right_line"] = f'+t_critical = {t_critical:.3f}'
+        labels["left_line"] = f'-t_critical = {-t_critical:.3f}'
+
+    t_view.update(args=(alpha, df, tail_type, t_critical), xlim=(float(x_min), float(x_max)))
+    region_plot.update((x_vals, y_vals), right, left, t_critical, labels,
+                       "t-Distribution with Critical Region", 't-value', 'Probability Density',
+                       None if keep_view else xlim, None if keep_view else T_VIEW_YLIM)
+
+def on_xlim_changed(xlim):
+    if t_view and tuple(xlim) != t_view["xlim"]:
+        view_debounce.request()
+
+def resample_t_view():
+    xlim = tuple(float(v) for v in ax.get_xlim())
+    if t_view and xlim != t_view["xlim"]:
+        plot_t_distribution(*t_view["args"], xlim=xlim)
+
+def plot_r_distribution(alpha, n, tail_type, r_critical):
+    # Exact null density of r on [-1, 1]; for large n it is a spike of width
+    # ~1/sqrt(n), so the grid is narrowed to where the mass and r_critical are
+    half_width = min(1.0, max(1.25 * r_critical, 8 / np.sqrt(n - 1)))
+    t_view.clear()
+    r_vals = np.union1d(np.linspace(-half_width, half_width, 2001), [-r_critical, r_critical])
+    density = r_null_pdf(r_vals, n)
+    density[~np.isfinite(density)] = np.nan  # n = 3 diverges at r = +-1
+    labels = {"curve": 'Null distribution of r'}
+
+    right = r_vals >= r_critical
+    left = r_vals <= -r_critical
     if tail_type == "1-tailed":
-        t_crit = t.ppf(1 - alpha, df)
+        left_fill = None
+        labels["right"] = f'Critical region (α = {alpha})'
+        labels["right_line"] = f'r_critical = {r_critical:.4f}'
     else:
-        t_crit = t.ppf(1 - alpha / 2, df)
-    r_crit = t_crit / np.sqrt(t_crit**2 + df)
-    return r_crit, t_crit, df
+        left_fill = (r_vals[left], density[left])
+        labels["right"] = f'Right critical region (α/2 = {alpha/2})'
+        labels["left"] = f'Left critical region (α/2 = {alpha/2})'
+        labels["right_line"] = f'+r_critical = {r_critical:.4f}'
+        labels["left_line"] = f'-r_critical = {-r_critical:.4f}'
+
+    region_plot.update((r_vals, density), (r_vals[right], density[right]), left_fill, r_critical, labels,
+                       f"Null Distribution of r (n = {n}) with Critical Region", 'r', 'Probability Density',
+                       (-half_width, half_width), (0, 1.05 * np.nanmax(density)))
 
 def calculate_and_plot():
+    # A power computation still running would otherwise replace this plot
+    worker.cancel("power")
     try:
         alpha = float(entry_alpha.get())
         n = int(entry_n.get())
         tail_type = tail_mode.get()
 
-        r_critical, t_critical, df = calculate_r_critical(alpha, n, tail_type)
+        r_critical, t_critical, df = cached_r_critical(alpha, n, tail_type)
 
         result_label.config(text=f"Critical r-value (±): {r_critical:.3f}")
 
-        ax.clear()
-        # Plotting the full t-distribution
-        x_vals = np.linspace(-5, 5, 1000)
-        y_vals = t.pdf(x_vals, df)
-        ax.plot(x_vals, y_vals, color='black', label='t-distribution')
-
-        if tail_type == "1-tailed":
-            x_fill = np.linspace(t_critical, 5, 500)
-            ax.fill_between(x_fill, t.pdf(x_fill, df), color='red', alpha=0.5, label=f'Critical region (α = {alpha})')
-            ax.axvline(t_critical, color='red', linestyle='--', label=f't_critical = {t_critical:.3f}')
+        if plot_view.get() == "r distribution":
+            plot_r_distribution(alpha, n, tail_type, r_critical)
         else:
-            t_crit_pos = t_critical
-            t_crit_neg = -t_critical
-            x_fill_right = np.linspace(t_crit_pos, 5, 500)
-            x_fill_left = np.linspace(-5, t_crit_neg, 500)
-            ax.fill_between(x_fill_right, t.pdf(x_fill_right, df), color='red', alpha=0.5, label=f'Right critical region (α/2 = {alpha/2})')
-            ax.fill_between(x_fill_left, t.pdf(x_fill_left, df), color='blue', alpha=0.5, label=f'Left critical region (α/2 = {alpha/2})')
-            ax.axvline(t_crit_pos, color='red', linestyle='--', label=f'+t_critical = {t_crit_pos:.3f}')
-            ax.axvline(t_crit_neg, color='blue', linestyle='--', label=f'-t_critical = {t_crit_neg:.3f}')
-
-        ax.set_title("t-Distribution with Critical Region", fontsize=28)
-        ax.set_xlabel('t-value', fontsize=24)
-        ax.set_ylabel('Probability Density', fontsize=24)
-        ax.legend(fontsize=16)
-        canvas.draw()
+            plot_t_distribution(alpha, df, tail_type, t_critical)
+        toolbar.update()  # Home goes back to this view
 
         calc_summary.config(text=f"""n = {n}
 df = {df}
@@ -62,6 +125,84 @@ r_critical = ± {r_critical:.4f} ({tail_type})""")
     except Exception as e:
         messagebox.showerror("Error", str(e))
 
+POWER_CURVE_RHOS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.7)
+
+def power_curves_job(rhos, n_vals, n, alpha, tail_type, job):
+    # Runs on the worker pool: one broadcast power call per rho (with the
+    # current n appended), so progress can be reported and the job can stop
+    # between rows
+    curves, at_n = [], []
+    for i, rho in enumerate(rhos):
+        job.check()
+        values = power(rho, np.append(n_vals, n), alpha, tail_type, method="exact")
+        curves.append(values[:-1])
+        at_n.append(values[-1])
+        job.progress((i + 1) / len(rhos))
+    return np.array(curves), np.array(at_n)
+
+def draw_power_curves(result, rhos, n_vals, n, alpha, tail_type):
+    curves, at_n = result
+    t_view.clear()
+    region_plot.invalidate()
+    ax.clear()
+    for rho, curve in zip(rhos, curves):
+        ax.plot(n_vals, curve, label=f'ρ = {rho}')
+    ax.axhline(0.8, color='gray', linestyle=':', label='Power = 0.8')
+    ax.axvline(n, color='black', linestyle='--', label=f'n = {n}')
+    ax.set_xscale('log')
+    ax.set_ylim(0, 1.02)
+    ax.set_title(f"Power of the {tail_type} r test (α = {alpha})", fontsize=28)
+    ax.set_xlabel('Sample size n', fontsize=24)
+    ax.set_ylabel('Power', fontsize=24)
+    ax.legend(fontsize=16)
+    canvas.draw()
+    toolbar.update()
+
+    result_label.config(text=f"Power curves for α = {alpha} ({tail_type})")
+    rows = "\n".join(f"ρ = {rho:<4} → power {p:.3f}" for rho, p in zip(rhos, at_n))
+    calc_summary.config(text=f"n = {n}, α = {alpha} ({tail_type})\n{rows}")
+
+def show_error(error):
+    messagebox.showerror("Error", str(error))
+
+def plot_power_curves():
+    try:
+        alpha = float(entry_alpha.get())
+        n = int(entry_n.get())
+        tail_type = tail_mode.get()
+
+        n_vals = np.unique(np.geomspace(4, max(200, 4 * n), 200).astype(int))
+        rhos = np.array(POWER_CURVE_RHOS)
+        worker.submit("power", power_curves_job, rhos, n_vals, n, alpha, tail_type,
+                      on_result=lambda result: draw_power_curves(result, rhos, n_vals, n, alpha, tail_type),
+                      on_progress=lambda done: result_label.config(text=f"Computing power curves… {done:.0%}"),
+                      on_error=show_error)
+        result_label.config(text="Computing power curves…")
+
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+def cancel_computation():
+    if worker.busy("power"):
+        worker.cancel("power")
+        result_label.config(text="Computation cancelled")
+
+def set_entry(entry, text):
+    entry.delete(0, tk.END)
+    entry.insert(0, text)
+
+def request_live_update(*_):
+    if live_mode.get():
+        live_throttle.request()
+
+def on_alpha_slider(value):
+    set_entry(entry_alpha, f"{10 ** float(value):.3g}")
+    request_live_update()
+
+def on_n_slider(value):
+    set_entry(entry_n, str(int(round(10 ** float(value)))))
+    request_live_update()
+
 def save_plot():
     file_path = filedialog.asksaveasfilename(defaultextension=".png",
                                              filetypes=[("PNG files", "*.png"), ("All files", "*.*")])
@@ -70,6 +211,9 @@ def save_plot():
         messagebox.showinfo("Saved", f"Plot saved to:\n{file_path}")
 
 def exit_app():
+    live_throttle.cancel()
+    view_debounce.cancel()
+    worker.shutdown()
     plt.close('all')  # Close all matplotlib figures
     root.destroy()    # Destroy the root window
 
@@ -108,10 +252,45 @@ tail_option.config(font=("Arial", 24))
 tail_option["menu"].config(font=("Arial", 24))
 tail_option.pack(side=tk.LEFT, padx=(0, 15))
 
+plot_view = tk.StringVar(value="t distribution")
+tk.Label(top_frame, text="Plot:", bg="#e6f0ff", font=("Arial", 24)).pack(side=tk.LEFT)
+view_option = tk.OptionMenu(top_frame, plot_view, "t distribution", "r distribution")
+view_option.config(font=("Arial", 24))
+view_option["menu"].config(font=("Arial", 24))
+view_option.pack(side=tk.LEFT, padx=(0, 15))
+
 tk.Button(top_frame, text="Calculate & Plot", command=calculate_and_plot, bg="#007acc", fg="white", font=("Arial", 24, "bold")).pack(side=tk.LEFT, padx=5)
+tk.Button(top_frame, text="📈 Power Curves", command=plot_power_curves, bg="#6f42c1", fg="white", font=("Arial", 24, "bold")).pack(side=tk.LEFT, padx=5)
+tk.Button(top_frame, text="⏹ Cancel", command=cancel_computation, bg="#6c757d", fg="white", font=("Arial", 24, "bold")).pack(side=tk.LEFT, padx=5)
 tk.Button(top_frame, text="💾 Save Plot", command=save_plot, bg="#28a745", fg="white", font=("Arial", 24, "bold")).pack(side=tk.LEFT, padx=5)
 tk.Button(top_frame, text="❌ Exit", command=exit_app, bg="#cc0000", fg="white", font=("Arial", 24, "bold")).pack(side=tk.LEFT, padx=5)
 
+# Live mode: sliders (log scale for both α and n) recompute and redraw while
+# they move, coalesced to one update per frame
+live_frame = tk.Frame(root, bg="#e6f0ff", padx=10, pady=5)
+live_frame.pack(fill=tk.X)
+
+live_mode = tk.BooleanVar(value=False)
+tk.Checkbutton(live_frame, text="Live mode", variable=live_mode, command=request_live_update, bg="#e6f0ff", font=("Arial", 24)).pack(side=tk.LEFT, padx=(0, 15))
+
+tk.Label(live_frame, text="log₁₀ α:", bg="#e6f0ff", font=("Arial", 24)).pack(side=tk.LEFT)
+alpha_slider = tk.Scale(live_frame, from_=-10, to=-0.5, resolution=0.001, orient=tk.HORIZONTAL, length=500,
+                        showvalue=False, command=on_alpha_slider, bg="#e6f0ff")
+alpha_slider.set(np.log10(0.05))
+alpha_slider.pack(side=tk.LEFT, padx=(0, 15))
+
+tk.Label(live_frame, text="log₁₀ n:", bg="#e6f0ff", font=("Arial", 24)).pack(side=tk.LEFT)
+n_slider = tk.Scale(live_frame, from_=np.log10(3), to=6, resolution=0.001, orient=tk.HORIZONTAL, length=700,
+                    showvalue=False, command=on_n_slider, bg="#e6f0ff")
+n_slider.set(np.log10(14))
+n_slider.pack(side=tk.LEFT, padx=(0, 15))
+
+live_throttle = FrameThrottle(root, calculate_and_plot)
+# Heavy computations (power curves) run here; results come back on the Tk loop
+worker = BackgroundWorker(root, max_workers=2)
+tail_mode.trace_add("write", request_live_update)
+plot_view.trace_add("write", request_live_update)
+
 result_label = tk.Label(root, text="Critical r-value (±): ", font=("Arial", 26, "bold"))
 result_label.pack(pady=5)
 
@@ -123,7 +302,12 @@ left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
 fig, ax = plt.subplots(figsize=(7, 5))
 canvas = FigureCanvasTkAgg(fig, master=left_panel)
+# Zoom/pan toolbar; the t curve is resampled for the visible range once
+# the view stops changing
+toolbar = NavigationToolbar2Tk(canvas, left_panel)
 canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+view_debounce = Debounce(root, resample_t_view)
+region_plot = CriticalRegionPlot(ax, on_xlim_changed=on_xlim_changed)
 
 right_panel = tk.Frame(main_frame, bg="#f0f6ff", width=820, padx=50)
 right_panel.pack(side=tk.RIGHT, fill=tk.Y)
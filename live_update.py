@@ -0,0 +1,74 @@
+import time
+
+# Rate limiting for live updates driven by Tk events (slider drags, spinbox
+# repeats). Every event just marks the view dirty; at most one recompute and
+# redraw runs per display frame, always for the latest state, so the
+# intermediate values of a fast drag are dropped instead of queuing up.
+# Debounce instead waits for a burst of events (zoom/pan steps) to settle.
+
+
+class FrameThrottle:
+    """Run callback() at most once per interval_ms, for the latest request.
+
+    request() can be called any number of times; the callback then runs
+    once on the Tk event loop at the next free frame slot. A slot opens
+    interval_ms after the previous callback finished, so a redraw that takes
+    longer than a frame still leaves the event loop time to process input.
+    """
+
+    def __init__(self, widget, callback, interval_ms=16):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval_ms / 1000
+        self._dirty = False
+        self._job = None
+        self._next_allowed = 0.0
+
+    def request(self):
+        self._dirty = True
+        if self._job is None:
+            delay = max(0.0, self._next_allowed - time.perf_counter())
+            self._job = self.widget.after(int(delay * 1000), self._flush)
+
+    def cancel(self):
+        """Drop any pending update."""
+        self._dirty = False
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _flush(self):
+        self._job = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            self.callback()
+        finally:
+            self._next_allowed = time.perf_counter() + self.interval
+            # Requests that arrived while the callback ran get the next slot
+            if self._dirty and self._job is None:
+                self._job = self.widget.after(int(self.interval * 1000), self._flush)
+
+
+class Debounce:
+    """Run callback() once, delay_ms after the last of a burst of requests."""
+
+    def __init__(self, widget, callback, delay_ms=120):
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self._job = None
+
+    def request(self):
+        self.cancel()
+        self._job = self.widget.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _fire(self):
+        self._job = None
+        self.callback()
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+import threading
+import time
+
+# Thread-safe LRU store shared by the result caches (RCriticalCache in
+# r_critical, PdfCurveCache in plot_controller). Subclasses build the key and
+# the compute call; this class keeps the entries, the lock and the counters.
+
+
+class LRUCache:
+    """Thread-safe LRU cache with hit / miss / eviction counters.
+
+    get(key, compute) returns the entry for key, calling compute() on a miss.
+    time_saved adds up, over all hits, the seconds the hit entries took to
+    compute. Counters are available from stats().
+    """
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (value, seconds it took to compute)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.time_saved = 0.0
+
+    def get(self, key, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.time_saved += entry[1]
+                return entry[0]
+
+        # Compute outside the lock so a slow miss doesn't block other threads
+        start = time.perf_counter()
+        value = compute()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (value, elapsed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "time_saved": self.time_saved,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.time_saved = 0.0
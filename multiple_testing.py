@@ -0,0 +1,204 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from r_critical import calculate_r_critical, p_value
+
+# Family-wise (Bonferroni, Holm, Hochberg) and false discovery rate
+# (Benjamini-Hochberg "bh", Benjamini-Yekutieli "by") corrections for many
+# correlation tests at once.
+#
+# Every method boils down to one adjusted significance level: a test is
+# rejected exactly when its raw p <= alpha_adjusted. That level is turned back
+# into an adjusted critical r with calculate_r_critical, so |r| >= r_crit
+# gives the same decisions as the corrected p-values.
+
+METHODS = ("bonferroni", "holm", "hochberg", "bh", "by")
+
+CorrectionResult = namedtuple("CorrectionResult", "reject p_adjusted alpha_adjusted r_crit")
+StreamingCorrectionResult = namedtuple("StreamingCorrectionResult", "m n_rejected alpha_adjusted r_crit")
+
+# Euler-Mascheroni constant, for the harmonic numbers in the "by" level
+_EULER_GAMMA = 0.5772156649015329
+# Below this m the harmonic number is summed term by term
+_HARMONIC_SUM_MAX = 1000
+
+# Histogram used by the streaming mode: bin 0 is [0, 1e-300], then log bins up to 1
+_STREAM_EDGES = np.concatenate([[0.0], np.logspace(-300, 0, 12001)])
+
+
+def _check_method(method):
+    if method not in METHODS:
+        raise ValueError(f"Unknown correction {method!r}, expected one of {METHODS}.")
+
+
+def _harmonic(m):
+    # H_m = 1 + 1/2 + ... + 1/m; past _HARMONIC_SUM_MAX the asymptotic series
+    # ln m + gamma + 1/(2m) - 1/(12m^2) + 1/(120m^4) is exact to double
+    # precision, so no length-m array is ever built (m can exceed memory in
+    # streaming mode)
+    if m <= _HARMONIC_SUM_MAX:
+        return math.fsum(1.0 / i for i in range(1, m + 1))
+    inv = 1.0 / m
+    return math.log(m) + _EULER_GAMMA + inv / 2 - inv * inv / 12 + inv ** 4 / 120
+
+
+def _level(method, alpha, m, k):
+    # Significance level the k-th smallest p-value (k = 1..m) is compared with
+    k = np.asarray(k, dtype=float)
+    if method == "bonferroni":
+        return np.full(k.shape, alpha / m)
+    if method in ("holm", "hochberg"):
+        return alpha / (m - k + 1)
+    if method == "bh":
+        return alpha * k / m
+    return alpha * k / (m * _harmonic(m))
+
+
+def _r_crit(alpha_adjusted, n, tail_type):
+    if n is None:
+        return None
+    return calculate_r_critical(alpha_adjusted, n, tail_type)[0]
+
+
+def _as_p_values(p):
+    p = np.asarray(p, dtype=float)
+    bad = ~((p >= 0) & (p <= 1))
+    if bad.any():
+        raise ValueError(f"p-values must be between 0 and 1 ({int(bad.sum())} invalid entries).")
+    return p
+
+
+def adjust_p_values(p, method="bh"):
+    """Adjusted p-values (same shape as p), via one O(m log m) sort."""
+    _check_method(method)
+    p = _as_p_values(p)
+    flat = p.ravel()
+    m = flat.size
+    if m == 0:
+        return p.copy()
+    order = np.argsort(flat, kind="stable")
+    ranked = flat[order]
+    k = np.arange(1, m + 1)
+    # p_(k) * alpha / level(k) is the smallest alpha at which p_(k) passes its own step
+    scaled = ranked * (1.0 / _level(method, 1.0, m, k))
+    if method == "holm":
+        scaled = np.maximum.accumulate(scaled)
+    elif method != "bonferroni":
+        scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(scaled, 1.0)
+    return adjusted.reshape(p.shape)
+
+
+def _count_rejected(ranked, method, alpha, m, rank_offset=0):
+    # Number of rejections decided by (a sorted slice of) the p-values whose
+    # smallest element has rank rank_offset + 1, or None if the slice holds
+    # no decision (no step-down failure / no step-up pass).
+    k = rank_offset + np.arange(1, ranked.size + 1)
+    level = _level(method, alpha, m, k)
+    if method == "holm":
+        fail = np.flatnonzero(ranked > level)
+        return int(k[fail[0]] - 1) if fail.size else None
+    ok = np.flatnonzero(ranked <= level)
+    return int(k[ok[-1]]) if ok.size else None
+
+
+def _alpha_adjusted(method, alpha, m, n_rejected):
+    # Level between the last rejected and the first accepted p-value
+    if method == "holm":
+        return float(_level(method, alpha, m, min(n_rejected + 1, m)))
+    return float(_level(method, alpha, m, max(n_rejected, 1)))
+
+
+def correct(p, alpha=0.05, method="bh", n=None, tail_type="2-tailed"):
+    """Apply a multiple-comparison correction to an array of p-values.
+
+    Returns CorrectionResult(reject, p_adjusted, alpha_adjusted, r_crit);
+    r_crit is the critical r at alpha_adjusted when the sample size n is
+    given, otherwise None.
+    """
+    _check_method(method)
+    p = _as_p_values(p)
+    m = p.size
+    p_adjusted = adjust_p_values(p, method)
+    if m == 0:
+        return CorrectionResult(p <= alpha, p_adjusted, alpha, _r_crit(alpha, n, tail_type))
+    n_rejected = _count_rejected(np.sort(p.ravel()), method, alpha, m)
+    if n_rejected is None:
+        n_rejected = m if method == "holm" else 0
+    alpha_adjusted = _alpha_adjusted(method, alpha, m, n_rejected)
+    reject = p <= alpha_adjusted
+    return CorrectionResult(reject, p_adjusted, alpha_adjusted, _r_crit(alpha_adjusted, n, tail_type))
+
+
+def correct_r(r, n, alpha=0.05, method="bh", tail_type="2-tailed"):
+    """correct() for observed correlations r that share one sample size n."""
+    return correct(p_value(r, n, tail_type), alpha, method, n, tail_type)
+
+
+def correct_streaming(chunks, alpha=0.05, method="bh", n=None, tail_type="2-tailed"):
+    """Two-pass correction for more p-values than fit in memory.
+
+    `chunks` is a callable returning a fresh iterable of p-value arrays (it
+    is called twice). Pass one counts the p-values into a fine log-spaced
+    histogram; that pins the decision boundary down to a narrow band of bins,
+    leaving out bins known to pass or fail as a whole (e.g. ties at p = 0 or
+    1). Pass two keeps only the p-values inside the band and resolves the
+    boundary exactly. Returns StreamingCorrectionResult(m, n_rejected,
+    alpha_adjusted, r_crit); reject a test when its p <= alpha_adjusted.
+    """
+    _check_method(method)
+    edges = _STREAM_EDGES
+    counts = np.zeros(edges.size - 1, dtype=np.int64)
+    for chunk in chunks():
+        chunk = _as_p_values(chunk).ravel()
+        counts += np.bincount(_bin_index(chunk), minlength=counts.size)
+    m = int(counts.sum())
+    if m == 0:
+        return StreamingCorrectionResult(0, 0, alpha, _r_crit(alpha, n, tail_type))
+
+    below = np.concatenate([[0], np.cumsum(counts)])  # F at each edge
+    f0, f1 = below[:-1], below[1:]
+    lower, upper = edges[:-1], edges[1:]
+    filled = counts > 0
+    # Rank of each bin's smallest p-value; capped at m so the empty bins past
+    # the last p-value do not put k = m + 1 into Holm's alpha / (m - k + 1)
+    first_rank = np.minimum(f0 + 1, m)
+    # Pass two only needs the bins between the decided ones: [first, last],
+    # with `decided` the rejection count if none of them settles it
+    if method == "holm":
+        # The first failing rank lies between the first bin that could fail
+        # and the first bin that must fail (all of whose p-values fail)
+        possible = filled & (upper > _level(method, alpha, m, first_rank))
+        certain = filled & (lower >= _level(method, alpha, m, f1))
+        first = int(np.argmax(possible)) if possible.any() else counts.size
+        last = (int(np.argmax(certain)) if certain.any() else counts.size) - 1
+        decided = int(below[last + 1])
+    else:
+        # The last passing rank lies between the last bin that must pass
+        # (all of whose p-values pass) and the last bin that could pass
+        possible = filled & (lower < _level(method, alpha, m, f1))
+        certain = filled & (upper <= _level(method, alpha, m, first_rank))
+        last = int(np.flatnonzero(possible)[-1]) if possible.any() else -1
+        first = (int(np.flatnonzero(certain)[-1]) if certain.any() else -1) + 1
+        decided = int(below[first])
+
+    n_rejected = None
+    if first <= last:
+        band = []
+        for chunk in chunks():
+            chunk = np.asarray(chunk, dtype=float).ravel()
+            idx = _bin_index(chunk)
+            band.append(chunk[(idx >= first) & (idx <= last)])
+        ranked = np.sort(np.concatenate(band))
+        n_rejected = _count_rejected(ranked, method, alpha, m, rank_offset=int(below[first]))
+    if n_rejected is None:
+        n_rejected = decided
+    alpha_adjusted = _alpha_adjusted(method, alpha, m, n_rejected)
+    return StreamingCorrectionResult(m, n_rejected, alpha_adjusted, _r_crit(alpha_adjusted, n, tail_type))
+
+
+def _bin_index(p):
+    return np.clip(np.searchsorted(_STREAM_EDGES, p, side="left") - 1, 0, _STREAM_EDGES.size - 2)
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from corr_scan import DEFAULT_BLOCK_SIZE, merge_tiles, scan_tile, standardize, tile_blocks
+from r_critical import calculate_r_critical
+
+# Process-pool version of corr_scan.scan_significant_pairs. The standardized
+# matrix is written straight into multiprocessing.shared_memory (never built
+# in private memory first, so peak memory is one matrix); every worker maps
+# the same buffer and only receives (i0, i1, j0, j1) tile coordinates, so the
+# input is never copied per worker. Workers send back just the significant
+# pairs of their tiles. Run this file directly for a 1..N core benchmark.
+
+_worker = {}
+
+
+def _attach(name, shape, r_crit):
+    # Pool initializer: map the shared standardized matrix in this worker
+    shm = shared_memory.SharedMemory(name=name)
+    _worker["shm"] = shm  # keep the mapping alive for the worker's lifetime
+    _worker["z"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker["r_crit"] = r_crit
+
+
+def _run_tile(tile):
+    return scan_tile(_worker["z"], *tile, _worker["r_crit"])
+
+
+def scan_significant_pairs_parallel(data, alpha=0.05, tail_type="2-tailed",
+                                    block_size=DEFAULT_BLOCK_SIZE, workers=None):
+    """Same result as corr_scan.scan_significant_pairs, computed by a pool
+    of `workers` processes (default: all cores).
+
+    Each worker's BLAS may itself be multi-threaded; for the cleanest scaling
+    limit it to one thread (e.g. OMP_NUM_THREADS=1) when workers > 1.
+    """
+    workers = workers or os.cpu_count() or 1
+    data = np.asarray(data)
+    if data.ndim != 2:
+        raise ValueError("Data must be a 2-D (n_samples x n_features) array.")
+    n, n_features = data.shape
+    r_crit, _, _ = calculate_r_critical(alpha, n, tail_type)
+    tiles = tile_blocks(n_features, block_size)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(n * n_features * 8, 1))
+    try:
+        shared = np.ndarray(data.shape, dtype=np.float64, buffer=shm.buf)
+        standardize(data, out=shared)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, shared.shape, r_crit)) as pool:
+            chunksize = max(1, len(tiles) // (workers * 4))
+            parts = list(pool.map(_run_tile, tiles, chunksize=chunksize))
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+    return merge_tiles(parts, n, r_crit, tail_type)
+
+
+def benchmark(n_samples=500, n_features=8000, block_size=DEFAULT_BLOCK_SIZE, max_workers=None, seed=0):
+    """Time the scan with 1, 2, 4, ... up to max_workers processes."""
+    max_workers = max_workers or os.cpu_count() or 1
+    data = np.random.default_rng(seed).standard_normal((n_samples, n_features))
+    counts = sorted({1, max_workers} | {2 ** k for k in range(max_workers.bit_length()) if 2 ** k <= max_workers})
+    print(f"{n_samples} samples x {n_features} features, block {block_size}")
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        result = scan_significant_pairs_parallel(data, block_size=block_size, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"  {workers:3d} workers: {elapsed:8.2f} s  speedup {baseline / elapsed:5.2f}x  "
+              f"({len(result.i)} significant pairs)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    benchmark(*args)
@@ -0,0 +1,176 @@
+import numpy as np
+
+from lru import LRUCache
+
+# Keeps the artists of the critical-region plot (density curve, shaded
+# critical regions, critical-value lines, legend) alive between updates.
+# The first update builds them; later ones only swap their data with
+# set_data / set_verts / set_xdata and redraw them by blitting over a cached
+# background of the static parts (axes, ticks, labels, title). A full
+# canvas.draw() only happens when that static layout changes: different
+# axis limits, labels or title, or a resize.
+#
+# The density curves themselves come from PdfCurveCache, keyed by df and
+# grid, and the shaded regions are slices of the cached curve, so changing
+# alpha or the tail type at a fixed n evaluates no pdf at all. When the user
+# zooms or pans, on_xlim_changed lets the caller resample the curve for the
+# visible range and push it back with update(..., xlim=None, ylim=None).
+
+
+class CriticalRegionPlot:
+    def __init__(self, ax, on_xlim_changed=None):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.on_xlim_changed = on_xlim_changed
+        self._artists = None
+        self._layout = None
+        self._legend = None
+        self._legend_key = None
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def invalidate(self):
+        """Forget the artists, e.g. after something else cleared the axes."""
+        self._artists = None
+        self._layout = None
+        self._legend = None
+        self._legend_key = None
+        self._background = None
+
+    def _build(self):
+        ax = self.ax
+        ax.clear()
+        curve, = ax.plot([], [], color='black', animated=True)
+        right = ax.fill_between([], [], color='red', alpha=0.5, animated=True)
+        left = ax.fill_between([], [], color='blue', alpha=0.5, animated=True)
+        right_line = ax.axvline(0, color='red', linestyle='--', animated=True)
+        left_line = ax.axvline(0, color='blue', linestyle='--', animated=True)
+        self._artists = {"curve": curve, "right": right, "left": left,
+                         "right_line": right_line, "left_line": left_line}
+        # ax.clear() drops axes callbacks, so this is reconnected on every build
+        if self.on_xlim_changed is not None:
+            ax.callbacks.connect("xlim_changed", lambda changed: self.on_xlim_changed(changed.get_xlim()))
+
+    def pixel_width(self):
+        """Width of the axes on screen, in pixels."""
+        return max(1, int(self.ax.bbox.width))
+
+    @staticmethod
+    def _fill_verts(x, y):
+        # Closed polygon of the area between (x, y) and the x axis
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        return [np.column_stack([np.r_[x[0], x, x[-1]], np.r_[0.0, y, 0.0]])] if x.size else []
+
+    def update(self, curve, right, left, crit, labels, title, xlabel, ylabel, xlim, ylim):
+        """Show a density curve with its critical region(s).
+
+        curve and right are (x, y) pairs; left is (x, y) for a 2-tailed test
+        or None for a 1-tailed one. The critical lines go at +crit and -crit.
+        labels maps "curve", "right", "left", "right_line" and "left_line"
+        to legend labels. xlim / ylim of None keep the current limits (the
+        user's zoom), so only the data changes.
+        """
+        if self._artists is None:
+            self._build()
+        a = self._artists
+        two_tailed = left is not None
+
+        a["curve"].set_data(*curve)
+        a["right"].set_verts(self._fill_verts(*right))
+        a["right_line"].set_xdata([crit, crit])
+        a["left"].set_verts(self._fill_verts(*left) if two_tailed else [])
+        a["left_line"].set_xdata([-crit, -crit])
+        a["left"].set_visible(two_tailed)
+        a["left_line"].set_visible(two_tailed)
+
+        # Legend entries follow the tail type; only their text changes otherwise
+        names = ["curve", "right", "left", "right_line", "left_line"] if two_tailed else ["curve", "right", "right_line"]
+        if self._legend_key != tuple(names):
+            if self._legend is not None:
+                self._legend.remove()
+            self._legend = self.ax.legend([a[k] for k in names], [labels[k] for k in names], fontsize=16)
+            self._legend.set_animated(True)
+            self._legend_key = tuple(names)
+        for text, name in zip(self._legend.get_texts(), names):
+            text.set_text(labels[name])
+
+        labels_changed = (title, xlabel, ylabel) != self._layout
+        xlim_changed = xlim is not None and tuple(xlim) != tuple(self.ax.get_xlim())
+        ylim_changed = ylim is not None and tuple(ylim) != tuple(self.ax.get_ylim())
+        if labels_changed or xlim_changed or ylim_changed or self._background is None:
+            self.ax.set_title(title, fontsize=28)
+            self.ax.set_xlabel(xlabel, fontsize=24)
+            self.ax.set_ylabel(ylabel, fontsize=24)
+            self._layout = (title, xlabel, ylabel)
+            if xlim is not None:
+                self.ax.set_xlim(*xlim)
+            if ylim is not None:
+                self.ax.set_ylim(*ylim)
+            self.canvas.draw()  # the draw_event handler caches the new background
+        else:
+            self._blit()
+
+    def _animated(self):
+        if self._artists is None:
+            return []
+        return list(self._artists.values()) + ([self._legend] if self._legend is not None else [])
+
+    def _draw_animated(self):
+        for artist in self._animated():
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+
+    def _on_draw(self, event):
+        # Runs after every full draw (including resizes): grab the static
+        # background, then paint the animated artists on top of it. savefig
+        # already renders animated artists itself.
+        if self._artists is None or event.canvas is not self.canvas or self.canvas.is_saving():
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self._draw_animated()
+
+    def _blit(self):
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.figure.bbox)
+
+
+def region_slice(x, y, lo, hi):
+    """Part of the sampled curve (x, y) between lo and hi, as new arrays.
+
+    The end points lo and hi are included, with y linearly interpolated, so
+    a region edge falls exactly on the critical value. Empty if lo >= hi
+    after clipping to the grid.
+    """
+    lo, hi = max(lo, x[0]), min(hi, x[-1])
+    if lo >= hi:
+        return np.empty(0), np.empty(0)
+    i = np.searchsorted(x, lo, side="right")
+    j = np.searchsorted(x, hi, side="left")
+    ends = np.interp([lo, hi], x, y)
+    return np.r_[lo, x[i:j], hi], np.r_[ends[0], y[i:j], ends[1]]
+
+
+class PdfCurveCache(LRUCache):
+    """Thread-safe LRU cache of pdf(x, df) evaluated on evenly spaced grids.
+
+    Keys are (df, x_min, x_max, points). Cached arrays are read-only, so
+    slices of them can be handed to artists without copying. Counters are
+    available from stats().
+    """
+
+    def __init__(self, pdf, maxsize=64):
+        super().__init__(maxsize)
+        self.pdf = pdf
+
+    def curve(self, df, x_min=-5.0, x_max=5.0, points=1000):
+        key = (float(df), float(x_min), float(x_max), int(points))
+        return self.get(key, lambda: self._evaluate(df, x_min, x_max, points))
+
+    def _evaluate(self, df, x_min, x_max, points):
+        x = np.linspace(x_min, x_max, points)
+        y = np.asarray(self.pdf(x, df), dtype=float)
+        x.flags.writeable = False
+        y.flags.writeable = False
+        return x, y
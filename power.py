@@ -0,0 +1,202 @@
+import numpy as np
+
+import t_dist
+from r_critical import _bad_entries, _smallest_passing_n, calculate_r_critical_batch, validate_inputs
+
+# Power of the Pearson r test against a true correlation rho: the probability
+# that |r| (or r, 1-tailed) reaches the critical r from calculate_r_critical.
+#
+# method="fisher" treats atanh(r) as normal with mean atanh(rho) and variance
+# 1/(n-3). method="exact" integrates the exact density of r for bivariate
+# normal data,
+#
+#   f(r) = (n-2)/pi (1-rho^2)^((n-1)/2) (1-r^2)^((n-4)/2) Int_0^inf (cosh w - rho r)^-(n-1) dw,
+#
+# over the rejection region. Both the outer integral (in z = atanh r) and the
+# inner one are fixed quadrature rules applied to whole arrays at once, so a
+# grid of thousands of scenarios costs a few array passes.
+#
+# Sample-size planning inverts power in n with the same bracketing search
+# r_critical.minimum_sample_size uses, run on all scenarios together.
+
+METHODS = ("fisher", "exact")
+# Default method of every function here, so that power(rho,
+# required_sample_size(rho)) compares like with like
+DEFAULT_METHOD = "fisher"
+
+# Outer rule: composite Gauss-Legendre over the tail being integrated
+_PANELS = 8
+_GL_X, _GL_W = np.polynomial.legendre.leggauss(16)
+# Inner rule: trapezoid in t after cosh w - rho r = (1 - rho r)(1 + sinh(t)^2)
+# stretching; the integrand is even and analytic in t, so this converges
+# geometrically (relative error ~1e-11 for every n >= 3)
+_TRAP_STEP = 0.25
+_TRAP_V = np.arange(41) * _TRAP_STEP
+# Scenarios integrated per block, to bound the (block x nodes x nodes) temporaries
+_EXACT_BLOCK = 256
+
+
+def _check_method(method):
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}.")
+
+
+def _validate_rho(rho):
+    bad_rho = ~(np.abs(rho) <= 1)
+    if bad_rho.any():
+        raise _bad_entries("True correlation must be between -1 and 1", bad_rho)
+
+
+def _logcosh(x):
+    x = np.abs(x)
+    return x + np.log1p(np.exp(-2 * x)) - np.log(2)
+
+
+def _log_inner(u, n):
+    # log of Int_0^inf (cosh w - 1 + u)^-(n-1) dw without the u^-(n-1) factor;
+    # the u-free parts of the integrand are evaluated once per n
+    g = 1 / np.sqrt(n - 1.5)
+    t = _TRAP_V * g[..., None]
+    weight = np.exp(-(2 * n[..., None] - 3) * _logcosh(t))
+    half_sinh2 = np.sinh(t) ** 2 / 2
+    terms = weight[..., None, :] / np.sqrt(1 + u[..., None] * half_sinh2[..., None, :])
+    total = _TRAP_STEP * g[..., None] * (terms.sum(axis=-1) - 0.5)
+    return 0.5 * np.log(2 * u) + np.log(total)
+
+
+def _log_density_z(z, zeta, n):
+    # log density of atanh(r) at the (scenario x node) points z under
+    # rho = tanh(zeta) and sample size n (one per scenario), written so that
+    # 1 - rho r = cosh(z - zeta) / (cosh zeta cosh z) never cancels
+    log_u = _logcosh(z - zeta) - _logcosh(zeta) - _logcosh(z)
+    return (np.log(n[:, None] - 2) - np.log(np.pi) - (n[:, None] - 1) * _logcosh(z - zeta)
+            + _logcosh(z) + _log_inner(np.exp(log_u), n))
+
+
+def _upper_exact(z_crit, zeta, n):
+    # P(atanh r >= z_crit) for flat arrays, integrating whichever side of
+    # z_crit holds less mass. The density falls off like a normal of variance
+    # 1/(n-2) near the mode and like exp(-(n-2)|z|) far out; `reach` covers both.
+    reach = 9 / np.sqrt(n - 2) + 37 / (n - 2)
+    upper_side = z_crit >= zeta
+    lo = np.where(upper_side, z_crit, zeta - reach)
+    hi = np.where(upper_side, z_crit + reach, z_crit)
+    width = (hi - lo) / _PANELS
+    starts = lo[:, None] + width[:, None] * np.arange(_PANELS)
+    nodes = (starts[:, :, None] + width[:, None, None] * (_GL_X + 1) / 2).reshape(len(lo), -1)
+    log_f = _log_density_z(nodes, zeta[:, None], n)
+    mass = np.exp(log_f) @ np.tile(_GL_W, _PANELS) * width / 2
+    return np.clip(np.where(upper_side, mass, 1 - mass), 0.0, 1.0)
+
+
+def _upper_fisher(z_crit, zeta, n):
+    return np.exp(t_dist.norm_logsf((z_crit - zeta) * np.sqrt(n - 3)))
+
+
+def _upper(z_crit, zeta, n, method):
+    # P(r >= r_crit) under rho = tanh(zeta); rho = +-1 makes r = rho exactly
+    prob = np.where(zeta > 0, 1.0, 0.0)
+    finite = np.isfinite(zeta)
+    if method == "fisher":
+        prob[finite] = _upper_fisher(z_crit[finite], zeta[finite], n[finite])
+        return prob
+    idx = np.flatnonzero(finite)
+    for start in range(0, idx.size, _EXACT_BLOCK):
+        part = idx[start:start + _EXACT_BLOCK]
+        prob[part] = _upper_exact(z_crit[part], zeta[part], n[part])
+    return prob
+
+
+def power(rho, n, alpha=0.05, tail_type="2-tailed", method=DEFAULT_METHOD):
+    """Power of the r test at true correlation rho, broadcast over all inputs.
+
+    The rejection region is |r| >= r_crit (2-tailed) or r >= r_crit in the
+    direction of rho (1-tailed), with r_crit from calculate_r_critical_batch.
+    method="fisher" uses the Fisher z normal approximation and needs n >= 4;
+    method="exact" integrates the exact distribution of r under bivariate
+    normality. Returns an array of the broadcast shape.
+    """
+    _check_method(method)
+    rho = np.asarray(rho, dtype=float)
+    rho, n, alpha, tail_type = np.broadcast_arrays(rho, np.asarray(n), np.asarray(alpha, dtype=float),
+                                                   np.asarray(tail_type))
+    alpha, df, one_tailed = validate_inputs(alpha, n, tail_type)
+    _validate_rho(rho)
+    if method == "fisher":
+        bad_n = ~(df > 1)
+        if bad_n.any():
+            raise _bad_entries("Sample size must be at least 4 for the Fisher z approximation", bad_n)
+
+    r_crit, _, _ = calculate_r_critical_batch(alpha, n, tail_type)
+    shape = rho.shape
+    z_crit = np.arctanh(np.asarray(r_crit, dtype=float)).ravel()
+    with np.errstate(divide="ignore"):
+        zeta = np.arctanh(rho).ravel()
+    n_flat = (df + 2).ravel()
+    one_tailed = one_tailed.ravel()
+
+    # 1-tailed: the tail rho points into; 2-tailed: both tails, the lower one
+    # being the upper tail of -rho by symmetry
+    result = _upper(z_crit, np.where(one_tailed, np.abs(zeta), zeta), n_flat, method)
+    two = np.flatnonzero(~one_tailed)
+    result[two] += _upper(z_crit[two], -zeta[two], n_flat[two], method)
+    return np.minimum(result, 1.0).reshape(shape)[()]
+
+
+def power_grid(rho, n, alpha=0.05, tail_type=("1-tailed", "2-tailed"), method=DEFAULT_METHOD):
+    """Power over the full rho x n x alpha x tail_type grid.
+
+    Each argument is a scalar or 1-D sequence; the result has shape
+    (len(rho), len(n), len(alpha), len(tail_type)).
+    """
+    axes = [np.atleast_1d(rho), np.atleast_1d(n), np.atleast_1d(alpha), np.atleast_1d(tail_type)]
+    grid = [a.reshape([-1 if k == i else 1 for k in range(4)]) for i, a in enumerate(axes)]
+    return power(*grid, method=method)
+
+
+def required_sample_size(rho, target_power=0.8, alpha=0.05, tail_type="2-tailed", method=DEFAULT_METHOD,
+                         max_n=10**9):
+    """Smallest n whose power at rho reaches target_power, vectorized.
+
+    rho, target_power, alpha and tail_type broadcast together. Power rises
+    with n, so every scenario starts from the Fisher z sample size
+    ((z_alpha + z_power) / atanh|rho|)^2 + 3, brackets the answer by
+    galloping and bisects, all scenarios at once. Scenarios that stay below
+    the target even at max_n (e.g. rho = 0) get -1.
+    """
+    _check_method(method)
+    rho = np.asarray(rho, dtype=float)
+    rho, target, alpha, tail_type = np.broadcast_arrays(rho, np.asarray(target_power, dtype=float),
+                                                        np.asarray(alpha, dtype=float), np.asarray(tail_type))
+    alpha, _, one_tailed = validate_inputs(alpha, 3, tail_type)
+    _validate_rho(rho)
+    bad_target = ~((target > 0) & (target < 1))
+    if bad_target.any():
+        raise _bad_entries("Target power must be between 0 and 1", bad_target)
+
+    shape = rho.shape
+    rho, target, alpha, one_tailed = rho.ravel(), target.ravel(), alpha.ravel(), one_tailed.ravel()
+    tails = np.where(one_tailed, "1-tailed", "2-tailed")
+    n_min = 4 if method == "fisher" else 3
+
+    def reaches(idx, n):
+        return power(rho[idx], n, alpha[idx], tails[idx], method) >= target[idx]
+
+    result = np.full(rho.shape, -1, dtype=np.int64)
+    todo = np.flatnonzero(reaches(np.arange(rho.size), np.full(rho.size, max_n)))
+    if todo.size == 0:
+        return result.reshape(shape)[()]
+
+    z_sum = (t_dist.norm_isf(np.where(one_tailed, alpha, alpha / 2)[todo])
+             + t_dist.norm_isf(1 - target[todo]))
+    with np.errstate(divide="ignore"):
+        guess = (z_sum / np.arctanh(np.abs(rho[todo]))) ** 2 + 3
+    result[todo] = _smallest_passing_n(lambda idx, n: reaches(todo[idx], n), guess, n_min, max_n)
+    return result.reshape(shape)[()]
+
+
+def planning_table(rho, target_power, alpha=0.05, tail_type="2-tailed", method=DEFAULT_METHOD):
+    """Required n for every (rho, target power) pair: rho rows x power columns."""
+    rho = np.atleast_1d(np.asarray(rho, dtype=float))
+    target_power = np.atleast_1d(np.asarray(target_power, dtype=float))
+    return required_sample_size(rho[:, None], target_power[None, :], alpha, tail_type, method)
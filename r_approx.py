@@ -0,0 +1,62 @@
+import numpy as np
+
+from r_critical import calculate_r_critical_batch, validate_inputs
+from r_approx_coeffs import FITS, N_MIN
+
+# Chebyshev fits of r_crit(n) for the standard alphas, built offline by
+# build_r_approx.py. Each lookup is one Clenshaw recurrence (12-18 terms) in
+# u = 1/df; n below N_MIN reads the exact stored value. An upper bound on
+# the absolute error of each fit against calculate_r_critical is stored with
+# it: the largest error over every n up to 50000 and a dense log grid to
+# 1e12, plus 10%, rounded up (all below 1e-13); see max_error().
+
+_U_MAX = 1 / (N_MIN - 2)
+
+
+def _clenshaw(coeffs, x):
+    b1 = np.zeros_like(x)
+    b2 = np.zeros_like(x)
+    x2 = 2 * x
+    for c in coeffs[:0:-1]:
+        b1, b2 = c + x2 * b1 - b2, b1
+    return coeffs[0] + x * b1 - b2
+
+
+def max_error(alpha, tail_type="2-tailed"):
+    """Upper bound on |r_crit error| of the fit, or None if there is no fit."""
+    fit = FITS.get((tail_type, float(alpha)))
+    return None if fit is None else fit[0]
+
+
+def r_critical_approx(alpha, n, tail_type="2-tailed"):
+    """Vectorized r_crit from the embedded fits.
+
+    Same arguments and return value (r_crit, t_crit, df) as
+    calculate_r_critical_batch. Alphas without a fit are passed on to
+    calculate_r_critical_batch. t_crit is derived from the fitted r_crit, so
+    for r_crit close to 1 (tiny n) it is only good to ~1e-11 relative.
+    """
+    alpha, df, one_tailed = validate_inputs(alpha, n, tail_type)
+    r_crit = np.empty(df.shape)
+    done = np.zeros(df.shape, dtype=bool)
+    whole = df == np.floor(df)
+
+    for (fit_tail, fit_alpha), (_, small, coeffs) in FITS.items():
+        sel = (alpha == fit_alpha) & (one_tailed == (fit_tail == "1-tailed")) & whole
+        if not sel.any():
+            continue
+        d = df[sel]
+        low = d < N_MIN - 2
+        values = np.empty(d.shape)
+        values[low] = np.take(small, d[low].astype(np.intp) - 1)
+        u = 1 / d[~low]
+        values[~low] = _clenshaw(coeffs, 2 * u / _U_MAX - 1) * np.sqrt(u)
+        r_crit[sel] = values
+        done |= sel
+
+    t_crit = np.empty(df.shape)
+    t_crit[done] = r_crit[done] * np.sqrt(df[done] / ((1 - r_crit[done]) * (1 + r_crit[done])))
+    if not done.all():
+        tails = np.where(one_tailed[~done], "1-tailed", "2-tailed")
+        r_crit[~done], t_crit[~done], _ = calculate_r_critical_batch(alpha[~done], df[~done] + 2, tails)
+    return r_crit, t_crit, df
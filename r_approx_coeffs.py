@@ -0,0 +1,354 @@
+# Generated by build_r_approx.py -- do not edit by hand.
+# Reference t quantiles from the scipy backend.
+N_MIN = 5
+
+# (tail_type, alpha): (bound on |r_crit error| for n >= N_MIN,
+#                      exact r_crit for n = 3..N_MIN-1, Chebyshev coefficients)
+FITS = {
+    ('1-tailed', 0.0001): (
+        7.89e-14,
+        (0.9999999506519784, 0.9997999999999999,),
+        (
+            2.5311787727323405,
+            -0.9698546223810353,
+            0.19011675283633622,
+            -0.02645199237909994,
+            0.0016647001491664666,
+            0.0002017057800197064,
+            -5.121985552262325e-05,
+            -7.41159508072057e-07,
+            1.7186236861443652e-06,
+            -1.6962908070666343e-07,
+            -4.6101691810346986e-08,
+            1.3426492380767396e-08,
+            3.023687651671085e-11,
+            -6.154832418310251e-10,
+            1.023240464190206e-10,
+            1.1214629477276689e-11,
+            -7.094634485975711e-12,
+            9.27582309762104e-13,
+        ),
+    ),
+    ('1-tailed', 0.0005): (
+        3.75e-14,
+        (0.9999987662997035, 0.999,),
+        (
+            2.3845903180388146,
+            -0.7760357666235669,
+            0.11904464972532147,
+            -0.011017981608049541,
+            -1.1744122123034016e-05,
+            0.00014432480105245355,
+            -8.964655849606383e-06,
+            -2.6687037025973895e-06,
+            4.3991970983949217e-07,
+            4.130301095881457e-08,
+            -1.8307182205123155e-08,
+            6.133759477562531e-10,
+            5.85117387757876e-10,
+            -1.0294403404487895e-10,
+            -7.059020091466585e-12,
+            5.178713709158016e-12,
+            -6.757451723289393e-13,
+        ),
+    ),
+    ('1-tailed', 0.001): (
+        2.25e-14,
+        (0.9999950652018581, 0.998,),
+        (
+            2.3080150010759657,
+            -0.6849636619662778,
+            0.0912101753328068,
+            -0.006408955655126188,
+            -0.00027149337267224456,
+            9.555787513932004e-05,
+            -4.892217571355104e-07,
+            -1.963123797350488e-06,
+            1.3927455009854304e-07,
+            4.2730742860551624e-08,
+            -7.924939614752573e-09,
+            -5.271563247590926e-10,
+            3.226152901969606e-10,
+            -2.456338412229214e-11,
+            -7.643575853011025e-12,
+            2.1165963707418075e-12,
+            -1.2103761095771485e-13,
+        ),
+    ),
+    ('1-tailed', 0.005): (
+        9.08e-14,
+        (0.9998766324816607, 0.9900000000000001,),
+        (
+            2.081221732688677,
+            -0.4573190179088924,
+            0.037242793389049796,
+            -0.00031763675706136547,
+            -0.00026429461576520216,
+            1.1164031961711586e-05,
+            3.339425410714529e-06,
+            -3.018797724518915e-07,
+            -5.0967061532780434e-08,
+            9.619254178843956e-09,
+            4.3750415145374694e-10,
+            -2.808094005615977e-10,
+            2.1747477451734593e-11,
+            4.5328709124201984e-12,
+            -1.374795973178579e-12,
+        ),
+    ),
+    ('1-tailed', 0.01): (
+        2.92e-14,
+        (0.9995065603657316, 0.9800000000000001,),
+        (
+            1.9523009885451643,
+            -0.35461012956145,
+            0.020181860674316036,
+            0.0005953933856056799,
+            -0.00015477344455406243,
+            -3.0855275289694744e-06,
+            2.003056979946809e-06,
+            -9.617136095007238e-09,
+            -3.446913116688721e-08,
+            2.2793441301209074e-09,
+            5.324684240845162e-10,
+            -1.0616546686516149e-10,
+            1.2654382402002638e-12,
+            2.478635008430222e-12,
+            -5.151000396441908e-13,
+        ),
+    ),
+    ('1-tailed', 0.025): (
+        8.20e-14,
+        (0.996917333733128, 0.95,),
+        (
+            1.7359265625810572,
+            -0.2200488342721398,
+            0.0047533540798464086,
+            0.0007372123497329141,
+            -3.408628047259828e-05,
+            -6.162631430695422e-06,
+            4.4673331198466005e-07,
+            6.797157144102032e-08,
+            -9.80679367051796e-09,
+            -4.1643810303917513e-10,
+            2.1732319716224732e-10,
+            -1.9799593530449436e-11,
+            -1.7126580660955923e-12,
+            8.657309426416316e-13,
+        ),
+    ),
+    ('1-tailed', 0.05): (
+        3.62e-14,
+        (0.9876883405951378, 0.8999999999999999,),
+        (
+            1.5211117508608116,
+            -0.1253690380608884,
+            -0.0012109762388722422,
+            0.00042813654171585855,
+            8.767799354290365e-06,
+            -3.260566142585676e-06,
+            -3.81860173402026e-08,
+            3.802708606572365e-08,
+            -1.8206079512016922e-09,
+            -3.943118012826537e-10,
+            8.096389385422412e-11,
+            -4.879171179465562e-12,
+            -1.126123544355151e-12,
+            4.0335646250725826e-13,
+        ),
+    ),
+    ('1-tailed', 0.1): (
+        8.81e-14,
+        (0.9510565162951536, 0.7999999999999999,),
+        (
+            1.2384861482845892,
+            -0.04587582588602373,
+            -0.0027225555716111675,
+            0.00010248164603612928,
+            1.4020464541069084e-05,
+            -7.133053175416486e-07,
+            -9.340124406832713e-08,
+            1.2032180887991365e-08,
+            3.8262271477083415e-11,
+            -1.8729182343813532e-10,
+            2.948672008856223e-11,
+            -1.0055600735003012e-12,
+            -6.257334999465138e-13,
+        ),
+    ),
+    ('2-tailed', 0.0001): (
+        7.39e-14,
+        (0.9999999876629946, 0.9999,),
+        (
+            2.5843545000785912,
+            -1.0460675429165949,
+            0.22241795232702088,
+            -0.035018391665044245,
+            0.0029719464977627204,
+            0.0001603834605678038,
+            -7.749914630302616e-05,
+            3.225268130509406e-06,
+            2.3077718534843013e-06,
+            -4.184783417699121e-07,
+            -3.959597667930713e-08,
+            2.483216686483281e-08,
+            -2.1252764777564678e-09,
+            -8.552578160944093e-10,
+            2.612835682153951e-10,
+            -5.1350227948199265e-12,
+            -1.2734845273093895e-11,
+            2.8960770565107433e-12,
+            2.7918638371151598e-14,
+        ),
+    ),
+    ('2-tailed', 0.0005): (
+        9.18e-14,
+        (0.9999996915748783, 0.9994999999999999,),
+        (
+            2.452322461737722,
+            -0.8625000888439871,
+            0.14876961713851147,
+            -0.01686842287041765,
+            0.0005011501354928178,
+            0.00018566300608870888,
+            -2.3285741007640246e-05,
+            -2.735854859913731e-06,
+            9.108663445921512e-07,
+            -6.170241324551844e-10,
+            -3.2056622136306334e-08,
+            3.920843153974005e-09,
+            7.402140673751547e-10,
+            -2.6729788540004945e-10,
+            1.0645765738596307e-11,
+            9.686745714321829e-12,
+            -2.287149621175459e-12,
+        ),
+    ),
+    ('2-tailed', 0.001): (
+        3.75e-14,
+        (0.9999987662997035, 0.999,),
+        (
+            2.3845903180388146,
+            -0.7760357666235669,
+            0.11904464972532147,
+            -0.011017981608049541,
+            -1.1744122123034016e-05,
+            0.00014432480105245355,
+            -8.964655849606383e-06,
+            -2.6687037025973895e-06,
+            4.3991970983949217e-07,
+            4.130301095881457e-08,
+            -1.8307182205123155e-08,
+            6.133759477562531e-10,
+            5.85117387757876e-10,
+            -1.0294403404487895e-10,
+            -7.059020091466585e-12,
+            5.178713709158016e-12,
+            -6.757451723289393e-13,
+        ),
+    ),
+    ('2-tailed', 0.005): (
+        1.09e-14,
+        (0.9999691576447898, 0.995,),
+        (
+            2.1890767098013195,
+            -0.557815857234536,
+            0.05832161252341745,
+            -0.002191817872205093,
+            -0.0003373712181972186,
+            3.927049610549333e-05,
+            3.586843509571835e-06,
+            -8.799646796723449e-07,
+            -3.0664579616466925e-08,
+            2.3072863466516422e-08,
+            -1.0613752417654307e-09,
+            -5.334871344228797e-10,
+            9.138084571232107e-11,
+            3.8177213305857035e-12,
+            -3.3784428244631908e-12,
+            4.847286800400753e-13,
+        ),
+    ),
+    ('2-tailed', 0.01): (
+        9.08e-14,
+        (0.9998766324816607, 0.9900000000000001,),
+        (
+            2.081221732688677,
+            -0.4573190179088924,
+            0.037242793389049796,
+            -0.00031763675706136547,
+            -0.00026429461576520216,
+            1.1164031961711586e-05,
+            3.339425410714529e-06,
+            -3.018797724518915e-07,
+            -5.0967061532780434e-08,
+            9.619254178843956e-09,
+            4.3750415145374694e-10,
+            -2.808094005615977e-10,
+            2.1747477451734593e-11,
+            4.5328709124201984e-12,
+            -1.374795973178579e-12,
+        ),
+    ),
+    ('2-tailed', 0.025): (
+        2.11e-14,
+        (0.999229036240723, 0.975,),
+        (
+            1.9051373269994691,
+            -0.3214552938298113,
+            0.015645490130981207,
+            0.0007217039657704168,
+            -0.00012031230879055409,
+            -5.1450693317602204e-06,
+            1.5492981178429845e-06,
+            3.348293147964567e-08,
+            -2.7417174690906235e-08,
+            1.077659345789184e-09,
+            4.594731213447538e-10,
+            -7.302264853621377e-11,
+            -6.213321506668732e-13,
+            1.9368235169010207e-12,
+            -3.7798020177056736e-13,
+        ),
+    ),
+    ('2-tailed', 0.05): (
+        8.20e-14,
+        (0.996917333733128, 0.95,),
+        (
+            1.7359265625810572,
+            -0.2200488342721398,
+            0.0047533540798464086,
+            0.0007372123497329141,
+            -3.408628047259828e-05,
+            -6.162631430695422e-06,
+            4.4673331198466005e-07,
+            6.797157144102032e-08,
+            -9.80679367051796e-09,
+            -4.1643810303917513e-10,
+            2.1732319716224732e-10,
+            -1.9799593530449436e-11,
+            -1.7126580660955923e-12,
+            8.657309426416316e-13,
+        ),
+    ),
+    ('2-tailed', 0.1): (
+        3.62e-14,
+        (0.9876883405951378, 0.8999999999999999,),
+        (
+            1.5211117508608116,
+            -0.1253690380608884,
+            -0.0012109762388722422,
+            0.00042813654171585855,
+            8.767799354290365e-06,
+            -3.260566142585676e-06,
+            -3.81860173402026e-08,
+            3.802708606572365e-08,
+            -1.8206079512016922e-09,
+            -3.943118012826537e-10,
+            8.096389385422412e-11,
+            -4.879171179465562e-12,
+            -1.126123544355151e-12,
+            4.0335646250725826e-13,
+        ),
+    ),
+}
@@ -0,0 +1,369 @@
+import os
+
+import numpy as np
+
+import t_dist
+from lru import LRUCache
+
+# Above this many degrees of freedom the "asymptotic" engine replaces the
+# exact t quantile with a Cornish-Fisher expansion around the normal quantile
+# (Abramowitz & Stegun 26.7.5, terms through 1/df^5). For df >= 1000 and tail
+# probabilities >= 1e-12 the absolute error on r_crit is below 1e-13 (and
+# below 1e-12 on t_crit; python validate_asymptotic.py checks both engines
+# against scipy over that domain); other inputs still use the exact path.
+ASYMPTOTIC_DF_THRESHOLD = t_dist.ASYMPTOTIC_DF
+ASYMPTOTIC_MIN_TAIL_PROB = t_dist.ASYMPTOTIC_MIN_TAIL_PROB
+ENGINES = ("exact", "asymptotic")
+
+# The exact t distribution comes from the NumPy-only t_dist module unless
+# scipy is asked for explicitly, either with set_t_backend("scipy") or by
+# setting R_CRITICAL_T_BACKEND=scipy. scipy is only imported in that case.
+# Even then tail probabilities below SCIPY_MIN_TAIL_PROB, and everything given
+# as log alpha, go to t_dist: scipy.stats.t.isf loses accuracy that far out at
+# small df (a factor of 2 off at df = 5, p = 1e-200, and -inf at p = 1e-250).
+T_BACKENDS = ("numpy", "scipy")
+SCIPY_MIN_TAIL_PROB = 1e-100
+_t_backend = os.environ.get("R_CRITICAL_T_BACKEND", "numpy")
+
+
+def set_t_backend(name):
+    global _t_backend
+    if name not in T_BACKENDS:
+        raise ValueError(f"Unknown t backend {name!r}, expected one of {T_BACKENDS}.")
+    _t_backend = name
+
+
+def get_t_backend():
+    return _t_backend
+
+
+def _scipy_t():
+    from scipy.stats import t
+    return t
+
+
+def _t_isf(p, df):
+    if _t_backend != "scipy":
+        return t_dist.t_isf(p, df)
+    p, df = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(df, dtype=float))
+    far = p < SCIPY_MIN_TAIL_PROB
+    t_crit = np.empty(p.shape)
+    t_crit[~far] = _scipy_t().isf(p[~far], df[~far])
+    t_crit[far] = t_dist.t_isf(p[far], df[far])
+    return t_crit[()]
+
+
+def _r_from_t(t_crit, df):
+    # r = t / sqrt(t^2 + df), without overflowing t^2 for the huge t of tiny alphas
+    with np.errstate(invalid="ignore"):
+        r_crit = t_crit / np.hypot(t_crit, np.sqrt(df))
+    return np.where(np.isposinf(t_crit), 1.0, r_crit)[()]
+
+
+def calculate_r_critical(alpha, n, tail_type="2-tailed", engine="exact"):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}.")
+    df = n - 2
+    if df <= 0:
+        raise ValueError("Sample size must be at least 3.")
+    tail_prob = alpha if tail_type == "1-tailed" else alpha / 2
+    if engine == "asymptotic" and df >= ASYMPTOTIC_DF_THRESHOLD and tail_prob >= ASYMPTOTIC_MIN_TAIL_PROB:
+        t_crit = t_dist.t_isf_cornish_fisher(tail_prob, df)
+    else:
+        # Upper-tail quantile straight from tail_prob: ppf(1 - tail_prob)
+        # would round 1 - tail_prob to 1 for alphas below ~1e-16
+        t_crit = _t_isf(tail_prob, df)
+    return _r_from_t(t_crit, df), t_crit, df
+
+
+def _bad_entries(message, mask):
+    # Report how many entries failed and where the first one is, instead of
+    # stopping at the first bad value.
+    bad = np.argwhere(mask)
+    first = tuple(int(i) for i in bad[0])
+    return ValueError(f"{message} ({len(bad)} invalid entries, first at index {first}).")
+
+
+def _validate_r(r):
+    bad_r = ~(np.abs(r) <= 1)
+    if bad_r.any():
+        raise _bad_entries("Correlation must be between -1 and 1", bad_r)
+
+
+def validate_inputs(alpha, n, tail_type="2-tailed"):
+    """Broadcast alpha, n and tail_type together and check every element.
+
+    Returns float arrays (alpha, df) and a boolean array that is True where
+    the test is one-tailed.
+    """
+    alpha = np.asarray(alpha, dtype=float)
+    n = np.asarray(n)
+    tail_type = np.asarray(tail_type)
+    alpha, n, tail_type = np.broadcast_arrays(alpha, n, tail_type)
+
+    if not np.issubdtype(n.dtype, np.number):
+        raise ValueError("Sample size must be numeric.")
+    df = n.astype(float) - 2
+
+    bad_n = ~(df > 0)
+    if bad_n.any():
+        raise _bad_entries("Sample size must be at least 3", bad_n)
+    bad_alpha = ~((alpha > 0) & (alpha < 1))
+    if bad_alpha.any():
+        raise _bad_entries("Significance level must be between 0 and 1", bad_alpha)
+    bad_tail = ~np.isin(tail_type, ("1-tailed", "2-tailed"))
+    if bad_tail.any():
+        raise _bad_entries("Test type must be '1-tailed' or '2-tailed'", bad_tail)
+
+    return alpha, df, tail_type == "1-tailed"
+
+
+def calculate_r_critical_batch(alpha, n, tail_type="2-tailed", engine="exact"):
+    """Vectorized calculate_r_critical.
+
+    alpha, n and tail_type may be scalars or arrays and are broadcast against
+    each other, e.g. alpha[:, None, None], n[None, :, None] and
+    np.array(["1-tailed", "2-tailed"])[None, None, :] give the full
+    alpha x n x tail grid. All t quantiles come from one vectorized isf call.
+    With engine="asymptotic" entries above ASYMPTOTIC_DF_THRESHOLD use the
+    Cornish-Fisher expansion instead.
+    Returns (r_crit, t_crit, df) arrays of the broadcast shape.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}.")
+    alpha, df, one_tailed = validate_inputs(alpha, n, tail_type)
+    tail_prob = np.where(one_tailed, alpha, alpha / 2)
+    if engine == "asymptotic":
+        fast = (df >= ASYMPTOTIC_DF_THRESHOLD) & (tail_prob >= ASYMPTOTIC_MIN_TAIL_PROB)
+        t_crit = np.empty(df.shape)
+        t_crit[fast] = t_dist.t_isf_cornish_fisher(tail_prob[fast], df[fast])
+        t_crit[~fast] = _t_isf(tail_prob[~fast], df[~fast])
+    else:
+        t_crit = _t_isf(tail_prob, df)
+    return _r_from_t(t_crit, df), t_crit, df
+
+
+def calculate_r_critical_log(log_alpha, n, tail_type="2-tailed"):
+    """calculate_r_critical_batch for alpha given as its natural log.
+
+    For corrected genome-wide thresholds (alpha of 1e-8 down to 1e-300 and
+    beyond): the t quantile is solved directly on log sf, so there is no
+    1 - alpha rounding and alpha may be smaller than the smallest float.
+    Where t_crit exceeds the float range it is inf and r_crit is 1.
+    Broadcasts like calculate_r_critical_batch; returns (r_crit, t_crit, df).
+    """
+    log_alpha = np.asarray(log_alpha, dtype=float)
+    log_alpha, n, tail_type = np.broadcast_arrays(log_alpha, np.asarray(n), np.asarray(tail_type))
+    _, df, one_tailed = validate_inputs(0.5, n, tail_type)
+    bad_alpha = ~(log_alpha < 0) | np.isneginf(log_alpha)
+    if bad_alpha.any():
+        raise _bad_entries("log(alpha) must be negative and finite", bad_alpha)
+    log_tail_prob = np.where(one_tailed, log_alpha, log_alpha - np.log(2))
+    t_crit = t_dist.t_isf_log(log_tail_prob, df)
+    return _r_from_t(t_crit, df), t_crit, df
+
+
+def p_value(r, n, tail_type="2-tailed", log10=False):
+    """p-value of an observed Pearson r with sample size n, vectorized.
+
+    Uses t = r*sqrt(df)/sqrt(1 - r^2) and the t survival function, computed
+    in log space from w = 1 - r^2 so that |r| close to 1 and p-values far
+    below the smallest float64 stay exact. 1-tailed p-values are for the
+    direction of the observed r, matching the |r| >= r_crit rule.
+    With log10=True returns log10(p) instead of p.
+    """
+    r = np.asarray(r, dtype=float)
+    r, n, tail_type = np.broadcast_arrays(r, np.asarray(n), np.asarray(tail_type))
+    _, df, one_tailed = validate_inputs(0.5, n, tail_type)
+    _validate_r(r)
+
+    r_abs = np.abs(r)
+    with np.errstate(divide="ignore"):
+        log_w = np.log1p(-r_abs) + np.log1p(r_abs)
+        log_1mw = 2 * np.log(r_abs)
+    log_p = t_dist.t_logsf_from_w(log_w, log_1mw, df)
+    log_p = np.minimum(np.where(one_tailed, log_p, log_p + np.log(2)), 0.0)
+    if log10:
+        return log_p / np.log(10)
+    return np.exp(log_p)
+
+
+def r_null_logpdf(r, n):
+    """log of the exact density of r under rho = 0, vectorized over r and n.
+
+    f(r) = (1 - r^2)^((n-4)/2) / B(1/2, (n-2)/2) on [-1, 1], for bivariate
+    normal data. The log-beta normalizer is computed once per distinct n
+    (with an asymptotic form for large n), so the density stays accurate for
+    n up to 1e6 and beyond, where it is a narrow spike of width ~1/sqrt(n).
+    """
+    r = np.asarray(r, dtype=float)
+    r, n = np.broadcast_arrays(r, np.asarray(n))
+    _, df, _ = validate_inputs(0.5, n, "2-tailed")
+    _validate_r(r)
+
+    df_values, which = np.unique(df, return_inverse=True)
+    log_norm = t_dist._log_beta_half(df_values / 2)[which].reshape(df.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_w = np.log1p(-r) + np.log1p(r)
+        log_f = np.where(df == 2, 0.0, (df - 2) / 2 * log_w) - log_norm
+    return log_f[()]
+
+
+def r_null_pdf(r, n):
+    """Exact density of r under rho = 0; see r_null_logpdf."""
+    return np.exp(r_null_logpdf(r, n))
+
+
+def fisher_z_ci(r, n, alpha=0.05, tail_type="2-tailed"):
+    """Fisher z confidence interval for rho, vectorized over r, n and alpha.
+
+    2-tailed gives the two-sided (1 - alpha) interval; 1-tailed gives the
+    one-sided bound in the direction of the observed r, with the other end
+    at +-1. Needs n >= 4. Returns (lower, upper) arrays.
+    """
+    r = np.asarray(r, dtype=float)
+    r, alpha, n, tail_type = np.broadcast_arrays(r, np.asarray(alpha, dtype=float), np.asarray(n), np.asarray(tail_type))
+    alpha, df, one_tailed = validate_inputs(alpha, n, tail_type)
+    _validate_r(r)
+    bad_n = ~(df > 1)
+    if bad_n.any():
+        raise _bad_entries("Sample size must be at least 4 for the Fisher z interval", bad_n)
+
+    with np.errstate(divide="ignore"):
+        z = np.arctanh(r)
+    half_width = t_dist.norm_isf(np.where(one_tailed, alpha, alpha / 2)) / np.sqrt(df - 1)
+    lower = np.tanh(z - half_width)
+    upper = np.tanh(z + half_width)
+    lower = np.where(one_tailed & (r < 0), -1.0, lower)
+    upper = np.where(one_tailed & (r >= 0), 1.0, upper)
+    return lower[()], upper[()]
+
+
+def compare_correlations(r1, n1, r2, n2, tail_type="2-tailed", log10=False):
+    """z-test of rho1 = rho2 for two independent samples, vectorized.
+
+    z = (atanh r1 - atanh r2) / sqrt(1/(n1 - 3) + 1/(n2 - 3)). As in
+    p_value, 1-tailed p-values are for the direction of the observed
+    difference. Returns (z, p), or (z, log10 p) with log10=True.
+    """
+    r1, n1, r2, n2, tail_type = np.broadcast_arrays(
+        np.asarray(r1, dtype=float), np.asarray(n1), np.asarray(r2, dtype=float), np.asarray(n2), np.asarray(tail_type))
+    _, df1, one_tailed = validate_inputs(0.5, n1, tail_type)
+    _, df2, _ = validate_inputs(0.5, n2, tail_type)
+    _validate_r(r1)
+    _validate_r(r2)
+    bad_n = ~((df1 > 1) & (df2 > 1))
+    if bad_n.any():
+        raise _bad_entries("Sample sizes must be at least 4 for the Fisher z test", bad_n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (np.arctanh(r1) - np.arctanh(r2)) / np.sqrt(1 / (df1 - 1) + 1 / (df2 - 1))
+    log_p = t_dist.norm_logsf(np.abs(z))
+    log_p = np.minimum(np.where(one_tailed, log_p, log_p + np.log(2)), 0.0)
+    p = log_p / np.log(10) if log10 else np.exp(log_p)
+    return z[()], p[()]
+
+
+def _smallest_passing_n(passes, guess, n_min, max_n):
+    # Smallest n in [n_min, max_n] with passes(idx, n) True, for a test that
+    # is monotone in n and already known to pass at max_n. passes(idx, n)
+    # checks the entries idx at the sample sizes n. Starts from the float
+    # array guess, gallops away from it with doubling steps until the answer
+    # is bracketed, then bisects.
+    guess = np.clip(np.ceil(np.nan_to_num(guess, nan=max_n, posinf=max_n)), n_min, max_n).astype(np.int64)
+    everything = np.arange(guess.size)
+    passed = passes(everything, guess)
+    # lo always fails (n_min - 1 stands in for "nothing below n_min"), hi always passes
+    lo = np.where(passed, n_min - 1, guess)
+    hi = np.where(passed, guess, max_n)
+
+    step = np.maximum(guess // 64, 1)
+    open_lo = passed & (hi > n_min)
+    open_hi = ~passed & (hi - lo > 1)
+    while open_lo.any() or open_hi.any():
+        probe = np.where(open_lo, np.maximum(hi - step, n_min), np.minimum(lo + step, max_n))
+        active = np.flatnonzero(open_lo | open_hi)
+        ok = np.zeros(guess.size, dtype=bool)
+        ok[active] = passes(active, probe[active])
+        hi = np.where((open_lo | open_hi) & ok, probe, hi)
+        lo = np.where((open_lo | open_hi) & ~ok, probe, lo)
+        open_lo &= ok & (probe > n_min)
+        open_hi &= ~ok & (probe < max_n)
+        step *= 2
+
+    while True:
+        active = np.flatnonzero(hi - lo > 1)
+        if active.size == 0:
+            return hi
+        mid = (lo[active] + hi[active]) // 2
+        ok = passes(active, mid)
+        hi[active] = np.where(ok, mid, hi[active])
+        lo[active] = np.where(ok, lo[active], mid)
+
+
+def minimum_sample_size(r, alpha, tail_type="2-tailed", max_n=10**12):
+    """Smallest n at which an observed |r| reaches r_critical(alpha, n).
+
+    Vectorized over r, alpha and tail_type (broadcast together). r_crit
+    falls monotonically with n, so each element starts from the large-sample
+    guess df = z^2 (1 - r^2) / r^2, gallops away from it until the answer is
+    bracketed and then bisects, which takes O(log n) r_crit evaluations.
+    Entries that are not significant even at max_n (e.g. r = 0) get -1.
+    """
+    r = np.asarray(r, dtype=float)
+    alpha, r, tail_type = np.broadcast_arrays(np.asarray(alpha, dtype=float), r, np.asarray(tail_type))
+    alpha, _, one_tailed = validate_inputs(alpha, 3, tail_type)
+    _validate_r(r)
+    r_abs = np.abs(r).ravel()
+    alpha, one_tailed = alpha.ravel(), one_tailed.ravel()
+    tails = np.where(one_tailed, "1-tailed", "2-tailed")
+
+    def significant(idx, n):
+        return r_abs[idx] >= calculate_r_critical_batch(alpha[idx], n, tails[idx])[0]
+
+    result = np.full(r_abs.shape, -1, dtype=np.int64)
+    todo = np.flatnonzero(significant(np.arange(r_abs.size), np.full(r_abs.size, max_n)))
+    if todo.size == 0:
+        return result.reshape(r.shape)[()]
+
+    z = t_dist.norm_isf(np.where(one_tailed, alpha, alpha / 2)[todo])
+    with np.errstate(divide="ignore"):
+        guess = z * z * (1 - r_abs[todo] ** 2) / r_abs[todo] ** 2 + 2
+    result[todo] = _smallest_passing_n(lambda idx, n: significant(todo[idx], n), guess, 3, max_n)
+    return result.reshape(r.shape)[()]
+
+
+class RCriticalCache(LRUCache):
+    """Thread-safe LRU cache of calculate_r_critical results.
+
+    Keys are (alpha, n, tail_type), with alpha and n as floats. `compute` is
+    the function called on a miss and defaults to calculate_r_critical; any
+    function with the same signature (e.g. a table lookup) works. Counters
+    are available from stats().
+    """
+
+    def __init__(self, maxsize=1024, compute=calculate_r_critical):
+        super().__init__(maxsize)
+        self.compute = compute
+
+    def __call__(self, alpha, n, tail_type="2-tailed"):
+        # Reject unknown tail types up front: calculate_r_critical would
+        # compute them as 2-tailed but they would be cached under their own key
+        if tail_type not in ("1-tailed", "2-tailed"):
+            raise ValueError("Test type must be '1-tailed' or '2-tailed'.")
+        # float(n), not int(n): non-integer n is accepted and must not share
+        # an entry with the integer it truncates to
+        key = (float(alpha), float(n), tail_type)
+        return self.get(key, lambda: self.compute(alpha, n, tail_type))
+
+    def set_compute(self, compute):
+        """Switch to another compute function, dropping what the old one cached."""
+        with self._lock:
+            self.compute = compute
+        self.clear()
+
+
+# Shared cache for the GUI and any worker threads. The GUI points it at the
+# precomputed table with cached_r_critical.set_compute(table.lookup) when
+# one has been built.
+cached_r_critical = RCriticalCache()
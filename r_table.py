@@ -0,0 +1,101 @@
+import os
+import sys
+
+import numpy as np
+
+from r_critical import calculate_r_critical, calculate_r_critical_batch, validate_inputs
+
+# Precomputed t_critical / r_critical values for the alphas people actually type.
+# The table lives in two .npy files next to this module:
+#   r_critical_table.npy         float64, shape (2, len(alphas), n_max - 2, 2)
+#                                indexed [tail, alpha, n - 3, (t_crit, r_crit)]
+#   r_critical_table_alphas.npy  the alpha grid, sorted ascending
+# tail index 0 is "1-tailed", 1 is "2-tailed". Build it once with
+#   python r_table.py [n_max]
+STANDARD_ALPHAS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1)
+TAIL_TYPES = ("1-tailed", "2-tailed")
+DEFAULT_N_MAX = 1_000_000
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "r_critical_table.npy")
+
+
+def _alphas_path(path):
+    root, ext = os.path.splitext(path)
+    return root + "_alphas" + ext
+
+
+def build_table(path=DEFAULT_TABLE_PATH, alphas=STANDARD_ALPHAS, n_max=DEFAULT_N_MAX):
+    """Compute the table and write it to disk, one (tail, alpha) slice at a time."""
+    alphas = np.unique(np.asarray(alphas, dtype=float))
+    n = np.arange(3, n_max + 1)
+    table = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64,
+                                      shape=(len(TAIL_TYPES), len(alphas), len(n), 2))
+    for i, tail_type in enumerate(TAIL_TYPES):
+        for j, alpha in enumerate(alphas):
+            r_crit, t_crit, _ = calculate_r_critical_batch(alpha, n, tail_type)
+            table[i, j, :, 0] = t_crit
+            table[i, j, :, 1] = r_crit
+    table.flush()
+    del table
+    np.save(_alphas_path(path), alphas)
+    return CriticalValueTable(path)
+
+
+class CriticalValueTable:
+    """Memory-mapped critical value table with a fallback to the exact calculation.
+
+    Lookups on the grid are plain array indexing; anything off the grid
+    (other alphas, n beyond n_max) goes through calculate_r_critical.
+    """
+
+    def __init__(self, path=DEFAULT_TABLE_PATH):
+        self.path = path
+        self.values = np.load(path, mmap_mode="r")
+        self.alphas = np.load(_alphas_path(path))
+        self.n_max = self.values.shape[2] + 2
+
+    def _alpha_index(self, alpha):
+        # Index into self.alphas for exact grid hits, -1 otherwise
+        idx = np.searchsorted(self.alphas, alpha)
+        idx = np.minimum(idx, len(self.alphas) - 1)
+        return np.where(self.alphas[idx] == alpha, idx, -1)
+
+    def lookup(self, alpha, n, tail_type="2-tailed"):
+        """Drop-in replacement for calculate_r_critical."""
+        j = int(self._alpha_index(alpha))
+        if j < 0 or tail_type not in TAIL_TYPES or not 3 <= n <= self.n_max or n != int(n):
+            return calculate_r_critical(alpha, n, tail_type)
+        t_crit, r_crit = self.values[TAIL_TYPES.index(tail_type), j, int(n) - 3]
+        return r_crit, t_crit, n - 2
+
+    def lookup_batch(self, alpha, n, tail_type="2-tailed"):
+        """Drop-in replacement for calculate_r_critical_batch."""
+        alpha, df, one_tailed = validate_inputs(alpha, n, tail_type)
+        j = self._alpha_index(alpha)
+        n_idx = df - 1
+        hit = (j >= 0) & (n_idx <= self.n_max - 3) & (n_idx == np.floor(n_idx))
+
+        t_crit = np.empty(alpha.shape)
+        r_crit = np.empty(alpha.shape)
+        tail_idx = np.where(one_tailed, 0, 1)
+        rows = self.values[tail_idx[hit], j[hit], n_idx[hit].astype(np.intp)]
+        t_crit[hit] = rows[:, 0]
+        r_crit[hit] = rows[:, 1]
+
+        miss = ~hit
+        if miss.any():
+            tails = np.where(one_tailed[miss], "1-tailed", "2-tailed")
+            r_crit[miss], t_crit[miss], _ = calculate_r_critical_batch(alpha[miss], df[miss] + 2, tails)
+        return r_crit, t_crit, df
+
+
+def load_table(path=DEFAULT_TABLE_PATH):
+    """Memory-map the table if it has been built, otherwise return None."""
+    if not (os.path.exists(path) and os.path.exists(_alphas_path(path))):
+        return None
+    return CriticalValueTable(path)
+
+
+if __name__ == "__main__":
+    n_max = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_N_MAX
+    table = build_table(n_max=n_max)
+    print(f"Wrote {table.path}: alphas {list(table.alphas)}, n = 3..{table.n_max}")
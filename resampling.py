@@ -0,0 +1,173 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from r_critical import calculate_r_critical
+from t_dist import norm_isf, norm_logsf
+
+# Resampling-based inference for Pearson r, for data where the t-based
+# calculate_r_critical (which assumes bivariate normality) is doubtful.
+#
+# Work is split into fixed-size batches, each with its own random stream
+# spawned from one SeedSequence, so results depend only on the seed and not
+# on how many workers ran the batches.
+
+PermutationResult = namedtuple(
+    "PermutationResult", "r n p_value r_crit_empirical r_crit_parametric n_permutations")
+BootstrapResult = namedtuple(
+    "BootstrapResult", "r n confidence ci_percentile ci_bca r_crit n_boot")
+
+POOLS = ("process", "thread")
+
+# Permutation index matrices are kept to about this many entries per batch
+_BATCH_ELEMENTS = 4_000_000
+
+
+def _unit_columns(x, y):
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.shape != y.shape:
+        raise ValueError("x and y must have the same length.")
+    if x.size < 3:
+        raise ValueError("Sample size must be at least 3.")
+    zx = x - x.mean()
+    zy = y - y.mean()
+    nx, ny = np.sqrt(zx @ zx), np.sqrt(zy @ zy)
+    if nx == 0 or ny == 0:
+        raise ValueError("x and y must not be constant.")
+    return zx / nx, zy / ny
+
+
+def _batch_sizes(total, n):
+    per_batch = max(1, _BATCH_ELEMENTS // n)
+    sizes = [per_batch] * (total // per_batch)
+    if total % per_batch:
+        sizes.append(total % per_batch)
+    return sizes
+
+
+def _run_batches(func, args, sizes, seed, workers, pool="process"):
+    # Run func(*args, size, seed_sequence) for every batch, optionally in a pool
+    if pool not in POOLS:
+        raise ValueError(f"Unknown pool {pool!r}, expected one of {POOLS}.")
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers == 1 or len(sizes) == 1:
+        return [func(*args, size, ss) for size, ss in zip(sizes, seeds)]
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+    with executor(max_workers=workers) as ex:
+        futures = [ex.submit(func, *args, size, ss) for size, ss in zip(sizes, seeds)]
+        return [f.result() for f in futures]
+
+
+def _permutation_batch(zx, zy, size, seed_seq):
+    # size permuted correlations from one (size x n) index matrix and one product
+    rng = np.random.default_rng(seed_seq)
+    index = rng.permuted(np.broadcast_to(np.arange(zx.size), (size, zx.size)), axis=1)
+    return zx[index] @ zy
+
+
+def permutation_test(x, y, alpha=0.05, tail_type="2-tailed", n_permutations=10_000,
+                     seed=None, workers=1):
+    """Permutation p-value and empirical critical r for the correlation of x and y.
+
+    workers > 1 (or None for all cores) spreads the batches over a process
+    pool. 1-tailed results are for the direction of the observed r, like
+    r_critical.p_value. Returns PermutationResult, with the t-based
+    r_critical next to the empirical one for comparison.
+    """
+    zx, zy = _unit_columns(x, y)
+    n = zx.size
+    r = float(np.clip(zx @ zy, -1.0, 1.0))
+    sizes = _batch_sizes(n_permutations, n)
+    r_perm = np.concatenate(_run_batches(_permutation_batch, (zx, zy), sizes, seed, workers))
+
+    if tail_type == "1-tailed":
+        stat, observed = r_perm * (1 if r >= 0 else -1), abs(r)
+    else:
+        stat, observed = np.abs(r_perm), abs(r)
+    # Count ties generously so rounding in the product can't shrink p
+    exceed = np.count_nonzero(stat >= observed - 1e-12)
+    p = (exceed + 1) / (n_permutations + 1)
+    r_crit_empirical = float(np.quantile(stat, 1 - alpha))
+    r_crit_parametric = float(calculate_r_critical(alpha, n, tail_type)[0])
+    return PermutationResult(r, n, p, r_crit_empirical, r_crit_parametric, n_permutations)
+
+
+def _rowwise_r(xs, ys):
+    # Pearson r of every row pair of two (batch x n) arrays
+    xs = xs - xs.mean(axis=1, keepdims=True)
+    ys = ys - ys.mean(axis=1, keepdims=True)
+    sxy = np.einsum("ij,ij->i", xs, ys)
+    sxx = np.einsum("ij,ij->i", xs, xs)
+    syy = np.einsum("ij,ij->i", ys, ys)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+
+
+def _bootstrap_batch(x, y, size, seed_seq):
+    rng = np.random.default_rng(seed_seq)
+    index = rng.integers(0, x.size, size=(size, x.size))
+    return _rowwise_r(x[index], y[index])
+
+
+def _jackknife_r(x, y):
+    # All n leave-one-out correlations in O(n) from running sums
+    n = x.size
+    x = x - x.mean()
+    y = y - y.mean()
+    sx, sy = x.sum(), y.sum()
+    sxx, syy, sxy = x @ x, y @ y, x @ y
+    m = n - 1
+    lx, ly = sx - x, sy - y
+    cxy = (sxy - x * y) - lx * ly / m
+    cxx = (sxx - x * x) - lx * lx / m
+    cyy = (syy - y * y) - ly * ly / m
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return cxy / np.sqrt(cxx * cyy)
+
+
+def _norm_cdf(z):
+    return np.exp(norm_logsf(-np.asarray(z, dtype=float)))
+
+
+def bootstrap_ci(x, y, confidence=0.95, n_boot=10_000, alpha=0.05, tail_type="2-tailed",
+                 seed=None, workers=1, pool="process"):
+    """Percentile and BCa bootstrap confidence intervals for Pearson r.
+
+    Resamples (x, y) pairs in batches and computes each batch's bootstrap
+    correlations in bulk. workers > 1 (or None for all cores) spreads the
+    batches over a process or thread pool (pool="process" / "thread"); the
+    result depends only on seed. The t-based r_critical for alpha is
+    returned alongside.
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    zx, zy = _unit_columns(x, y)
+    n = x.size
+    r = float(np.clip(zx @ zy, -1.0, 1.0))
+
+    sizes = _batch_sizes(n_boot, n)
+    r_boot = np.concatenate(_run_batches(_bootstrap_batch, (x, y), sizes, seed, workers, pool))
+    r_boot = r_boot[np.isfinite(r_boot)]
+
+    tail = (1 - confidence) / 2
+    ci_percentile = tuple(float(v) for v in np.quantile(r_boot, [tail, 1 - tail]))
+
+    # BCa: bias correction from the share of bootstrap r below r, acceleration
+    # from the jackknife skewness
+    share = np.clip(np.count_nonzero(r_boot < r) / r_boot.size, 1 / r_boot.size, 1 - 1 / r_boot.size)
+    z0 = -norm_isf(share)
+    jack = _jackknife_r(x, y)
+    jack = jack[np.isfinite(jack)]
+    d = jack.mean() - jack
+    denom = 6 * (d @ d) ** 1.5
+    accel = (d ** 3).sum() / denom if denom > 0 else 0.0
+    z = norm_isf(np.array([1 - tail, tail]))
+    adjusted = _norm_cdf(z0 + (z0 + z) / (1 - accel * (z0 + z)))
+    ci_bca = tuple(float(v) for v in np.quantile(r_boot, adjusted))
+
+    r_crit = float(calculate_r_critical(alpha, n, tail_type)[0])
+    return BootstrapResult(r, n, confidence, ci_percentile, ci_bca, r_crit, r_boot.size)
@@ -0,0 +1,88 @@
+from collections import namedtuple
+
+import numpy as np
+
+from r_critical import calculate_r_critical
+
+# Online Pearson correlation for (x, y) streams that never fit in memory.
+# Keeps Welford-style running means and co-moments; chunks are folded in with
+# the pairwise (Chan et al.) update, which is also how two accumulators from
+# parallel readers are merged, so merged results equal a single pass.
+
+CorrelationStatus = namedtuple("CorrelationStatus", "r n r_crit significant")
+
+
+class OnlineCorrelation:
+    def __init__(self, alpha=0.05, tail_type="2-tailed"):
+        self.alpha = alpha
+        self.tail_type = tail_type
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0   # sum of squared deviations of x
+        self.m2_y = 0.0
+        self.c_xy = 0.0   # sum of cross deviations
+
+    def update(self, x, y):
+        """Add one (x, y) sample."""
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+        return self
+
+    def update_chunk(self, x, y):
+        """Add a chunk of samples given as two equal-length arrays."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if x.shape != y.shape:
+            raise ValueError("x and y chunks must have the same length.")
+        if x.size == 0:
+            return self
+        chunk = OnlineCorrelation(self.alpha, self.tail_type)
+        chunk.n = x.size
+        chunk.mean_x = x.mean()
+        chunk.mean_y = y.mean()
+        dx = x - chunk.mean_x
+        dy = y - chunk.mean_y
+        chunk.m2_x = dx @ dx
+        chunk.m2_y = dy @ dy
+        chunk.c_xy = dx @ dy
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fold another accumulator into this one (in place)."""
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        self.m2_x += other.m2_x + dx * dx * weight
+        self.m2_y += other.m2_y + dy * dy * weight
+        self.c_xy += other.c_xy + dx * dy * weight
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def r(self):
+        if self.n < 2 or self.m2_x <= 0 or self.m2_y <= 0:
+            return float("nan")
+        return float(np.clip(self.c_xy / np.sqrt(self.m2_x * self.m2_y), -1.0, 1.0))
+
+    def status(self):
+        """Current r, n, r_critical and whether |r| >= r_critical.
+
+        r_crit is None until there are at least 3 samples.
+        """
+        r = self.r
+        if self.n < 3:
+            return CorrelationStatus(r, self.n, None, False)
+        r_crit, _, _ = calculate_r_critical(self.alpha, self.n, self.tail_type)
+        return CorrelationStatus(r, self.n, float(r_crit), bool(abs(r) >= r_crit))
@@ -0,0 +1,687 @@
+import math
+
+import numpy as np
+
+# NumPy-only Student t (and standard normal) distribution functions, so the
+# calculator doesn't have to import scipy at startup. Everything is computed
+# in log space where it matters, which keeps far-tail probabilities and
+# quantiles accurate. Agreement with scipy.stats.t is ~1e-12 relative or
+# better for every df >= 1 (python validate_t_dist.py checks this).
+#
+#   sf(t) = 1/2 * I_x(df/2, 1/2),  x = df / (df + t^2), t >= 0
+#
+# I_x is the regularized incomplete beta function, evaluated with a Lentz
+# continued fraction. Quantiles invert that relation: a Hill (1970) starting
+# value followed by Newton steps on log sf.
+#
+# The continued fraction needs O(sqrt(df)) terms near the centre of the
+# distribution and loses accuracy with them, so for df >= LARGE_DF and
+# x > 1/e the DiDonato & Morris (1992) BGRAT expansion of I_x(a, 1/2) for
+# large a is used instead. It converges to full precision in a few terms and
+# has no upper limit on df.
+#
+# The Cornish-Fisher expansion of t around the normal quantile (Abramowitz &
+# Stegun 26.7.5, terms through 1/df^5; |error in t| < 1e-12 for
+# df >= ASYMPTOTIC_DF and tail probabilities >= ASYMPTOTIC_MIN_TAIL_PROB) is
+# only a starting value for the quantile here. r_critical's "asymptotic"
+# engine returns it without the exact refinement.
+ASYMPTOTIC_DF = 1000
+ASYMPTOTIC_MIN_TAIL_PROB = 1e-12
+LARGE_DF = 1000
+
+_LOG_HALF = math.log(0.5)
+_HALF_LOG_PI = 0.5 * math.log(math.pi)
+_HALF_LOG_2PI = 0.5 * math.log(2 * math.pi)
+# Largest argument math.exp takes without OverflowError
+_MAX_EXP_ARG = math.log(np.finfo(float).max)
+_EPS = 1e-15
+_NEWTON_TOL = 1e-13
+_TINY = 1e-300
+_CF_MAX_ITER = 5000
+_SCALAR_SIZE = 4
+_NEWTON_MAX_ITER = 50
+# Cornish-Fisher is used as a quantile start while (z^2 / df) stays below
+# this, i.e. up to z = 7 at df = 1000
+_CF_START_MAX_RATIO = 0.049
+
+# Lanczos approximation (g = 7, 9 terms)
+_LANCZOS_G = 7
+_LANCZOS = (0.99999999999980993, 676.5203681218851, -1259.1392167224028,
+            771.32342877765313, -176.61502916214059, 12.507343278686905,
+            -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7)
+
+# Acklam's rational approximation of the normal quantile, used as a start value
+_ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+             1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+             6.680131188771972e+01, -1.328068155288572e+01)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+             -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+             3.754408661907416e+00)
+
+# Chebyshev coefficients of log(erfcx(x) / t), t = 2 / (2 + x), in 2t - 1
+# (the Numerical Recipes 3 erfc scheme); absolute error ~1e-17 for all x >= 0
+_ERFC_CHEB = (-0.6513268598908547, 0.6419697923564902, 0.019476473204185836, -0.009561514786808632,
+              -0.0009465953444820369, 0.00036683949785276145, 4.252332480690777e-05,
+              -2.0278578112534242e-05, -1.6242900046470256e-06, 1.3036558355805232e-06,
+              1.5626441722066142e-08, -8.523809591492654e-08, 6.5290544390988515e-09,
+              5.059343495551469e-09, -9.91364156493033e-10, -2.273651222931836e-10,
+              9.646791102015527e-11, 2.3940380830391146e-12, -6.886027526497553e-12,
+              8.944879273090725e-13, 3.130921399342958e-13, -1.1270822361367252e-13,
+              3.810905255189232e-16, 7.106097613609237e-15, -1.5230282014571043e-15,
+              -9.457494571291233e-17, 1.210237189224279e-16, -2.816663087747177e-17)
+
+
+def _bgrat_coefficients(b, count):
+    # p_n of DiDonato & Morris (1992) eq. 9.4
+    p = [1.0]
+    for n in range(1, count):
+        total = sum((m * b - n) * p[n - m] / math.factorial(2 * m + 1) for m in range(1, n))
+        p.append(total / n + (b - 1) / math.factorial(2 * n + 1))
+    return tuple(p)
+
+
+_BGRAT_P = _bgrat_coefficients(0.5, 30)
+
+
+def _polyval(coeffs, x):
+    result = np.zeros_like(x) + coeffs[0]
+    for c in coeffs[1:]:
+        result = result * x + c
+    return result
+
+
+def _lgamma(x):
+    # log Gamma(x) for x >= 0.5
+    x = x - 1
+    series = np.full_like(x, _LANCZOS[0])
+    for i, c in enumerate(_LANCZOS[1:], start=1):
+        series = series + c / (x + i)
+    tt = x + _LANCZOS_G + 0.5
+    return _HALF_LOG_2PI + (x + 0.5) * np.log(tt) - tt + np.log(series)
+
+
+def _stirling_correction(x):
+    # log Gamma(x) - [(x - 1/2) log x - x + log(2 pi)/2], x >= 10
+    x2 = 1 / (x * x)
+    return (1 / 12 + x2 * (-1 / 360 + x2 * (1 / 1260 + x2 * (-1 / 1680 + x2 / 1188)))) / x
+
+
+def _log1pexp(x):
+    # log(1 + e^x) without overflow
+    return np.where(x > 0, x + np.log1p(np.exp(-np.abs(x))), np.log1p(np.exp(np.minimum(x, 0))))
+
+
+def _log_w(abs_x, df):
+    # log w and log(1 - w) for w = df / (df + x^2), without cancellation.
+    # From x^2 / df itself while that is a normal float, otherwise from logs,
+    # so the |x| > 1e154 of tiny alphas never overflow x^2.
+    with np.errstate(divide="ignore", over="ignore", under="ignore"):
+        ratio = abs_x * abs_x / df
+        log_ratio = 2 * np.log(abs_x) - np.log(df)
+    plain = (ratio > 1e-300) & (ratio < 1e300)
+    ratio = np.where(plain, ratio, 1.0)
+    log_w = np.where(plain, -np.log1p(ratio), -_log1pexp(log_ratio))
+    log_1mw = np.where(plain, -np.log1p(1 / ratio), -_log1pexp(-log_ratio))
+    return log_w, log_1mw
+
+
+def _log_beta_half(a):
+    """log B(a, 1/2), accurate for large a where lgamma differences cancel."""
+    a = np.asarray(a, dtype=float)
+    result = np.empty_like(a)
+    small = a < 10
+    s = a[small]
+    result[small] = _lgamma(s) + _HALF_LOG_PI - _lgamma(s + 0.5)
+    b = a[~small]
+    result[~small] = (_HALF_LOG_PI + 0.5 - 0.5 * np.log(b) - b * np.log1p(0.5 / b)
+                      + _stirling_correction(b) - _stirling_correction(b + 0.5))
+    return result
+
+
+def _betacf(a, b, x):
+    """Continued fraction for I_x(a, b) (modified Lentz), vectorized.
+
+    Converged entries drop out of the working set, so the cost follows the
+    slowest element only for the elements that need it. A handful of
+    elements (the scalar API) go through plain floats instead, where the
+    per-call overhead of NumPy would dominate.
+    """
+    if x.size <= _SCALAR_SIZE:
+        values = [_betacf_one(float(ai), float(bi), float(xi)) for ai, bi, xi in zip(a.flat, b.flat, x.flat)]
+        return np.array(values).reshape(x.shape)
+    h = np.empty_like(x)
+    idx = np.arange(x.size)
+    a, b, x = a.ravel(), b.ravel(), x.ravel()
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = np.ones_like(x)
+    d = 1 - qab * x / qap
+    d = 1 / np.where(np.abs(d) < _TINY, _TINY, d)
+    hh = d.copy()
+    for m in range(1, _CF_MAX_ITER + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / np.where(np.abs(d) < _TINY, _TINY, d)
+        c = 1 + aa / c
+        c = np.where(np.abs(c) < _TINY, _TINY, c)
+        hh *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / np.where(np.abs(d) < _TINY, _TINY, d)
+        c = 1 + aa / c
+        c = np.where(np.abs(c) < _TINY, _TINY, c)
+        delta = d * c
+        hh *= delta
+        done = np.abs(delta - 1) < _EPS
+        if done.any():
+            h.flat[idx[done]] = hh[done]
+            keep = ~done
+            if not keep.any():
+                return h
+            idx, a, b, x = idx[keep], a[keep], b[keep], x[keep]
+            qab, qap, qam = qab[keep], qap[keep], qam[keep]
+            c, d, hh = c[keep], d[keep], hh[keep]
+    h.flat[idx] = hh
+    return h
+
+
+def _betacf_one(a, b, x):
+    # _betacf for one element, on Python floats (the _TINY guards inlined)
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = 1.0
+    d = 1 - qab * x / qap
+    d = 1 / (_TINY if abs(d) < _TINY else d)
+    h = d
+    for m in range(1, _CF_MAX_ITER + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (_TINY if abs(d) < _TINY else d)
+        c = 1 + aa / c
+        c = _TINY if abs(c) < _TINY else c
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (_TINY if abs(d) < _TINY else d)
+        c = 1 + aa / c
+        c = _TINY if abs(c) < _TINY else c
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < _EPS:
+            break
+    return h
+
+
+def _log_betainc_front(a, b, log_x, log_1mx, log_beta):
+    # log of x^a (1 - x)^b / (a B(a, b))
+    return a * log_x + b * log_1mx - np.log(a) - log_beta
+
+
+def _cornish_fisher(z, df):
+    # t quantile as a polynomial in the normal quantile z, and dt/dz
+    z2 = z * z
+    g = ((z2 + 1) * z / 4,
+         ((5 * z2 + 16) * z2 + 3) * z / 96,
+         (((3 * z2 + 19) * z2 + 17) * z2 - 15) * z / 384,
+         ((((79 * z2 + 776) * z2 + 1482) * z2 - 1920) * z2 - 945) * z / 92160,
+         (((((27 * z2 + 339) * z2 + 930) * z2 - 1782) * z2 - 765) * z2 + 17955) * z / 368640)
+    dg = ((3 * z2 + 1) / 4,
+          ((25 * z2 + 48) * z2 + 3) / 96,
+          (((21 * z2 + 95) * z2 + 51) * z2 - 15) / 384,
+          ((((711 * z2 + 5432) * z2 + 7410) * z2 - 5760) * z2 - 945) / 92160,
+          (((((297 * z2 + 3051) * z2 + 6510) * z2 - 8910) * z2 - 2295) * z2 + 17955) / 368640)
+    tt = g[4] / df
+    dt = dg[4] / df
+    for k in (3, 2, 1, 0):
+        tt = (g[k] + tt) / df
+        dt = (dg[k] + dt) / df
+    return z + tt, 1 + dt
+
+
+def t_isf_cornish_fisher(p, df):
+    """Large-df approximation of the upper t quantile (see ASYMPTOTIC_DF)."""
+    return _cornish_fisher(norm_isf(p), df)[0]
+
+
+def _log_betainc_large_a(a, log_x):
+    # log I_x(a, 1/2) for large a by the BGRAT expansion (DiDonato & Morris
+    # 1992, eqs. 9-9.6 with b = 1/2): I ~ Q(1/2, u) Gamma(a + 1/2) / (Gamma(a) T^(1/2))
+    # times a series in the J_n / J_0 ratios, with T = a - 1/4, u = -T log x
+    # and Q(1/2, u) = erfc(sqrt u). Each term is ~(log x / 2T)^2 times the last.
+    big_t = a - 0.25
+    u = -big_t * log_x
+    root_u = np.sqrt(u)
+    log_q = _erfc_log(root_u)
+    inv_j0 = root_u * np.exp(-(log_q + u)) / np.sqrt(np.pi)
+    lx2 = (log_x / 2) ** 2
+    t4 = 4 * big_t * big_t
+    ratio = np.ones_like(u)
+    lxp = np.ones_like(u)
+    total = np.zeros_like(u)
+    b2n = 0.5
+    for p_n in _BGRAT_P[1:]:
+        ratio = (b2n * (b2n + 1) * ratio + (u + b2n + 1) * lxp * inv_j0) / t4
+        lxp = lxp * lx2
+        b2n += 2
+        term = p_n * ratio
+        total += term
+        if np.all(np.abs(term) <= _EPS * np.abs(1 + total)):
+            break
+    log_gamma_ratio = _log_beta_half(a) - _HALF_LOG_PI  # log Gamma(a) / Gamma(a + 1/2)
+    return log_q - log_gamma_ratio - 0.5 * np.log(big_t) + np.log1p(total)
+
+
+def _log_upper_tail(abs_x, log_w, log_1mw, df, log_beta=None):
+    # log P(T > |x|) given log w and log(1 - w), w = df / (df + x^2)
+    a = df / 2
+    if log_beta is None:
+        log_beta = _log_beta_half(a)
+    log_tail = np.empty_like(abs_x)
+
+    large = (df >= LARGE_DF) & (log_w > -1)
+    if large.any():
+        log_tail[large] = _log_betainc_large_a(a[large], log_w[large])
+
+    # I_w(a, 1/2) directly where its continued fraction converges, otherwise
+    # through the complement 1 - I_{1-w}(1/2, a). All are halved at the end.
+    direct = (np.exp(log_w) < (a + 1) / (a + 2.5)) & ~large
+    if direct.any():
+        ad, ld, l1d, lbd = a[direct], log_w[direct], log_1mw[direct], log_beta[direct]
+        log_tail[direct] = (_log_betainc_front(ad, 0.5, ld, l1d, lbd)
+                            + np.log(_betacf(ad, np.full_like(ad, 0.5), np.exp(ld))))
+    comp = ~direct & ~large
+    if comp.any():
+        ac, lc, l1c, lbc = a[comp], log_w[comp], log_1mw[comp], log_beta[comp]
+        upper = np.exp(_log_betainc_front(np.full_like(ac, 0.5), ac, l1c, lc, lbc)
+                       + np.log(_betacf(np.full_like(ac, 0.5), ac, np.exp(l1c))))
+        log_tail[comp] = np.log1p(-upper)
+    return log_tail + _LOG_HALF
+
+
+def t_logsf(x, df):
+    """log P(T > x) for Student's t with df degrees of freedom."""
+    x, df = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(df, dtype=float))
+    x, df = x.astype(float), df.astype(float)
+    log_w, log_1mw = _log_w(np.abs(x), df)
+    log_tail = _log_upper_tail(np.abs(x), log_w, log_1mw, df)
+
+    # log_tail is log P(T > |x|); flip for negative x
+    result = np.where(x >= 0, log_tail, np.log1p(-np.exp(log_tail)))
+    return result[()] if result.ndim == 0 else result
+
+
+def _newton_terms(x, df, log_beta):
+    # log sf and log pdf at x >= 0 for the quantile search, sharing w and the
+    # normalizer log B(df/2, 1/2) between them and across iterations
+    log_w, log_1mw = _log_w(x, df)
+    log_sf = _log_upper_tail(x, log_w, log_1mw, df, log_beta)
+    log_pdf = (df + 1) / 2 * log_w - 0.5 * np.log(df) - log_beta
+    return log_sf, log_pdf
+
+
+def t_logsf_from_w(log_w, log_1mw, df):
+    """log P(T > |t|) from log w and log(1 - w), where w = df / (df + t^2).
+
+    Useful when w is known more precisely than t itself, e.g. w = 1 - r^2
+    for a correlation coefficient r close to +-1.
+    """
+    log_w, log_1mw, df = (a.astype(float) for a in np.broadcast_arrays(
+        np.asarray(log_w, dtype=float), np.asarray(log_1mw, dtype=float), np.asarray(df, dtype=float)))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        abs_x = np.sqrt(df) * np.exp((log_1mw - log_w) / 2)
+        result = _log_upper_tail(abs_x, log_w, log_1mw, df)
+    return result[()] if result.ndim == 0 else result
+
+
+def t_sf(x, df):
+    return np.exp(t_logsf(x, df))
+
+
+def t_cdf(x, df):
+    return np.exp(t_logsf(-np.asarray(x, dtype=float), df))
+
+
+def t_logpdf(x, df):
+    x, df = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(df, dtype=float))
+    log_w, _ = _log_w(np.abs(x), df)
+    result = (df + 1) / 2 * log_w - 0.5 * np.log(df) - _log_beta_half(df / 2)
+    return result[()] if result.ndim == 0 else result
+
+
+def t_pdf(x, df):
+    return np.exp(t_logpdf(x, df))
+
+
+def _norm_ppf_lower_start(log_p):
+    # Acklam's approximation of the normal quantile for p <= 0.5, from log p
+    p = np.exp(log_p)
+    result = np.empty_like(log_p)
+    low = p < 0.02425
+    q = np.sqrt(-2 * log_p[low])
+    result[low] = _polyval(_ACKLAM_C, q) / _polyval(_ACKLAM_D + (1.0,), q)
+    q = p[~low] - 0.5
+    r = q * q
+    result[~low] = _polyval(_ACKLAM_A, r) * q / _polyval(_ACKLAM_B + (1.0,), r)
+    return result
+
+
+def _hill_start(log_p, df, log_beta):
+    """Hill (1970, CACM Algorithm 396) approximation of the upper t quantile.
+
+    log_p is the log of the one-sided tail probability (<= log 0.5) and
+    log_beta is log B(df/2, 1/2).
+    """
+    log_two_p = log_p + np.log(2)
+    a = 1 / (df - 0.5)
+    b = 48 / (a * a)
+    c = ((20700 * a / b - 98) * a / b - 16) * a / b + 96.36
+    d = ((94.5 / (b + c) - 3) / b + 1) * np.sqrt(a * np.pi / 2) * df
+    y = np.exp((2 / df) * (np.log(d) + log_two_p))
+
+    normal = y > 0.05 + a
+    with np.errstate(all="ignore"):
+        x = _norm_ppf_lower_start(log_p)
+        xx = x * x
+        cc = np.where(df < 5, c + 0.3 * (df - 4.5) * (x + 0.6), c)
+        cc = (((0.05 * d * x - 5) * x - 7) * x - 2) * x + b + cc
+        yn = (((((0.4 * xx + 6.3) * xx + 36) * xx + 94.5) / cc - xx - 3) / b + 1) * x
+        yn = a * yn * yn
+        yn = np.where(yn > 0.002, np.expm1(yn), 0.5 * yn * yn + yn)
+        yt = (((1 / (((df + 6) / (df * y) - 0.089 * d - 0.822) * (df + 2) * 3)
+                + 0.5 / (df + 4)) * y - 1) * (df + 1) / (df + 2) + 1 / y)
+        start = np.sqrt(df * np.where(normal, yn, yt))
+
+    # Closed forms for df = 1 (Cauchy) and df = 2, switching to their
+    # leading terms in log space once p is tiny
+    p = np.exp(log_p)
+    tiny = log_p < np.log(1e-8)
+    with np.errstate(all="ignore"):
+        cauchy = np.where(tiny, np.exp(-log_p - np.log(np.pi)), 1 / np.tan(np.pi * p))
+        df2 = np.where(tiny, np.exp(-(log_p + np.log(2)) / 2), np.sqrt(2 / (2 * p * (2 - 2 * p)) - 2))
+    start = np.where(df == 1, cauchy, start)
+    start = np.where(df == 2, df2, start)
+    # Far out, where the formulas above overflow, use the leading tail term
+    # sf(t) ~ (df / t^2)^(df/2) / (df B(df/2, 1/2)) directly in log space;
+    # +inf then means the quantile itself is beyond the float range
+    half = df / 2
+    with np.errstate(over="ignore"):
+        tail = np.exp((np.log(df) - (log_p + np.log(df) + log_beta) / half) / 2)
+    start = np.where(np.isfinite(start) & (start > 0), start, tail)
+    return np.where((np.isfinite(start) & (start > 0)) | (start == np.inf), start, 1.0)
+
+
+# Plain-float versions of the quantile search for one element at a time. A
+# scalar t_isf call through the array code above spends nearly all its time
+# in NumPy per-call overhead; these follow the same steps on Python floats.
+
+def _exp_one(x):
+    return math.inf if x > _MAX_EXP_ARG else math.exp(x)
+
+
+def _polyval_one(coeffs, x):
+    result = coeffs[0]
+    for c in coeffs[1:]:
+        result = result * x + c
+    return result
+
+
+def _log_beta_half_one(a):
+    if a < 10:
+        return math.lgamma(a) + _HALF_LOG_PI - math.lgamma(a + 0.5)
+    return (_HALF_LOG_PI + 0.5 - 0.5 * math.log(a) - a * math.log1p(0.5 / a)
+            + _stirling_correction(a) - _stirling_correction(a + 0.5))
+
+
+def _log_w_one(abs_x, df):
+    if abs_x == 0:
+        return 0.0, -math.inf
+    ratio = abs_x * abs_x / df
+    if 1e-300 < ratio < 1e300:
+        return -math.log1p(ratio), -math.log1p(1 / ratio)
+    log_ratio = 2 * math.log(abs_x) - math.log(df)
+    if log_ratio > 0:
+        return -(log_ratio + math.log1p(math.exp(-log_ratio))), -math.log1p(math.exp(-log_ratio))
+    return -math.log1p(math.exp(log_ratio)), log_ratio - math.log1p(math.exp(log_ratio))
+
+
+def _log_betainc_large_a_one(a, log_x, log_beta):
+    # _log_betainc_large_a for one element, with log_beta = log B(a, 1/2)
+    big_t = a - 0.25
+    u = -big_t * log_x
+    root_u = math.sqrt(u)
+    log_q = float(_erfc_log(root_u))
+    inv_j0 = root_u * math.exp(-(log_q + u)) / math.sqrt(math.pi)
+    lx2 = (log_x / 2) ** 2
+    t4 = 4 * big_t * big_t
+    ratio = lxp = 1.0
+    total = 0.0
+    b2n = 0.5
+    for p_n in _BGRAT_P[1:]:
+        ratio = (b2n * (b2n + 1) * ratio + (u + b2n + 1) * lxp * inv_j0) / t4
+        lxp *= lx2
+        b2n += 2
+        term = p_n * ratio
+        total += term
+        if abs(term) <= _EPS * abs(1 + total):
+            break
+    return log_q - (log_beta - _HALF_LOG_PI) - 0.5 * math.log(big_t) + math.log1p(total)
+
+
+def _newton_terms_one(x, df, log_beta):
+    # _newton_terms (log sf and log pdf at x > 0) for one element
+    log_w, log_1mw = _log_w_one(x, df)
+    a = df / 2
+    if df >= LARGE_DF and log_w > -1:
+        log_tail = _log_betainc_large_a_one(a, log_w, log_beta)
+    elif math.exp(log_w) < (a + 1) / (a + 2.5):
+        log_tail = (a * log_w + 0.5 * log_1mw - math.log(a) - log_beta
+                    + math.log(_betacf_one(a, 0.5, math.exp(log_w))))
+    else:
+        upper = math.exp(0.5 * log_1mw + a * log_w - math.log(0.5) - log_beta
+                         + math.log(_betacf_one(0.5, a, math.exp(log_1mw))))
+        log_tail = math.log1p(-upper) if upper < 1 else -math.inf
+    log_pdf = (df + 1) / 2 * log_w - 0.5 * math.log(df) - log_beta
+    return log_tail + _LOG_HALF, log_pdf
+
+
+def _norm_ppf_lower_start_one(log_p):
+    if log_p < math.log(0.02425):
+        q = math.sqrt(-2 * log_p)
+        return _polyval_one(_ACKLAM_C, q) / _polyval_one(_ACKLAM_D + (1.0,), q)
+    q = math.exp(log_p) - 0.5
+    r = q * q
+    return _polyval_one(_ACKLAM_A, r) * q / _polyval_one(_ACKLAM_B + (1.0,), r)
+
+
+def _norm_isf_log_one(log_q):
+    # norm_isf_log for one log_q < log 1/2
+    z = -_norm_ppf_lower_start_one(log_q)
+    upper = float(_erfc_log(abs(z) / math.sqrt(2))) + _LOG_HALF
+    log_sf = upper if z >= 0 else math.log1p(-math.exp(upper))
+    hazard = math.exp(-0.5 * z * z - _HALF_LOG_2PI - log_sf)
+    step = (log_sf - log_q) / hazard
+    return z + step / (1 + step * (hazard - z) / 2)
+
+
+def _hill_start_one(log_p, df, log_beta):
+    # _hill_start for one element
+    start = math.nan
+    if df == 1:
+        if log_p < math.log(1e-8):
+            start = _exp_one(-log_p - math.log(math.pi))
+        else:
+            start = 1 / math.tan(math.pi * math.exp(log_p))
+    elif df == 2:
+        if log_p < math.log(1e-8):
+            start = _exp_one(-(log_p + math.log(2)) / 2)
+        else:
+            p = math.exp(log_p)
+            start = math.sqrt(2 / (2 * p * (2 - 2 * p)) - 2)
+    else:
+        a = 1 / (df - 0.5)
+        b = 48 / (a * a)
+        c = ((20700 * a / b - 98) * a / b - 16) * a / b + 96.36
+        d = ((94.5 / (b + c) - 3) / b + 1) * math.sqrt(a * math.pi / 2) * df
+        y = _exp_one((2 / df) * (math.log(d) + log_p + math.log(2)))
+        if y <= 0.05 + a:
+            if y > 0:
+                yt = (((1 / (((df + 6) / (df * y) - 0.089 * d - 0.822) * (df + 2) * 3)
+                        + 0.5 / (df + 4)) * y - 1) * (df + 1) / (df + 2) + 1 / y)
+                start = math.sqrt(df * yt) if yt > 0 else math.nan
+        else:
+            x = _norm_ppf_lower_start_one(log_p)
+            xx = x * x
+            cc = c + 0.3 * (df - 4.5) * (x + 0.6) if df < 5 else c
+            cc = (((0.05 * d * x - 5) * x - 7) * x - 2) * x + b + cc
+            yn = (((((0.4 * xx + 6.3) * xx + 36) * xx + 94.5) / cc - xx - 3) / b + 1) * x
+            yn = a * yn * yn
+            yn = (math.expm1(yn) if yn < _MAX_EXP_ARG else math.inf) if yn > 0.002 else 0.5 * yn * yn + yn
+            start = math.sqrt(df * yn)
+    if 0 < start < math.inf:
+        return start
+    # Leading tail term, as in _hill_start; inf if the quantile overflows
+    start = _exp_one((math.log(df) - (log_p + math.log(df) + log_beta) / (df / 2)) / 2)
+    return start if start > 0 else 1.0
+
+
+def _t_isf_log_one(log_p, df):
+    # t_isf_log for one element on Python floats
+    if not (0 < df < math.inf) or math.isnan(log_p):
+        return float(_t_isf_log_array(np.array(log_p), np.array(df)))
+    if log_p > 0:
+        return math.nan
+    flip = log_p > _LOG_HALF
+    log_q = log_p
+    if flip:
+        q = -math.expm1(log_p)
+        log_q = math.log(q) if q > 0 else -math.inf
+    if log_q == -math.inf:
+        result = math.inf
+    elif log_q >= _LOG_HALF:
+        result = 0.0
+    else:
+        log_beta = _log_beta_half_one(df / 2)
+        result = math.nan
+        if df >= LARGE_DF:
+            z = _norm_isf_log_one(log_q)
+            if z * z <= _CF_START_MAX_RATIO * df:
+                result = _cornish_fisher(z, df)[0]
+        if math.isnan(result):
+            result = _hill_start_one(log_q, df, log_beta)
+        for _ in range(_NEWTON_MAX_ITER if result < math.inf else 0):
+            log_sf, log_pdf = _newton_terms_one(result, df, log_beta)
+            new = max(result + (log_sf - log_q) * _exp_one(log_sf - log_pdf), result / 2)
+            converged = abs(new - result) <= _NEWTON_TOL * abs(new)
+            result = new
+            if converged:
+                break
+    return -result if flip else result
+
+
+def t_isf_log(log_p, df):
+    """Upper t quantile from the log of the tail probability.
+
+    Solves log sf(t) = log_p by Newton's method, which stays accurate for
+    tail probabilities far below the double-precision spacing near 1.
+    """
+    log_p, df = np.broadcast_arrays(np.asarray(log_p, dtype=float), np.asarray(df, dtype=float))
+    if log_p.size <= _SCALAR_SIZE:
+        values = [_t_isf_log_one(float(lp), float(d)) for lp, d in zip(log_p.flat, df.flat)]
+        result = np.array(values).reshape(log_p.shape)
+        return result[()] if result.ndim == 0 else result
+    return _t_isf_log_array(log_p, df)
+
+
+def _t_isf_log_array(log_p, df):
+    log_p, df = log_p.astype(float), df.astype(float)
+    # Upper half only; p > 1/2 follows from symmetry
+    flip = log_p > _LOG_HALF
+    log_q = np.where(flip, np.log(-np.expm1(log_p)), log_p)
+    log_beta = _log_beta_half(df / 2)
+    lq, dfa, log_beta = log_q.ravel(), df.ravel(), log_beta.ravel()
+    flat = np.empty(lq.shape)
+    # For large df the Cornish-Fisher value is a far better start than Hill's,
+    # so Hill's is only computed for the rest
+    hill = np.ones(lq.shape, dtype=bool)
+    large = np.flatnonzero((dfa >= LARGE_DF) & np.isfinite(lq) & (lq < _LOG_HALF))
+    if large.size:
+        z = norm_isf_log(lq[large])
+        cf = z * z <= _CF_START_MAX_RATIO * dfa[large]
+        large = large[cf]
+        flat[large] = _cornish_fisher(z[cf], dfa[large])[0]
+        hill[large] = False
+    flat[hill] = _hill_start(lq[hill], dfa[hill], log_beta[hill])
+    flat[lq == _LOG_HALF] = 0.0
+
+    active = np.flatnonzero((lq < _LOG_HALF) & np.isfinite(lq) & np.isfinite(flat))
+    for _ in range(_NEWTON_MAX_ITER):
+        if active.size == 0:
+            break
+        tt, ld, da = flat[active], lq[active], dfa[active]
+        log_sf, log_pdf = _newton_terms(tt, da, log_beta[active])
+        step = (log_sf - ld) * np.exp(log_sf - log_pdf)
+        new = np.maximum(tt + step, tt / 2)
+        flat[active] = new
+        active = active[np.abs(new - tt) > _NEWTON_TOL * np.abs(new)]
+    result = flat.reshape(log_q.shape)
+
+    result = np.where(np.isneginf(log_q), np.inf, result)
+    result = np.where(flip, -result, result)
+    result = np.where(np.isnan(log_p) | (log_p > 0), np.nan, result)
+    return result[()] if result.ndim == 0 else result
+
+
+def t_isf(p, df):
+    """Inverse survival function: t such that P(T > t) = p."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return t_isf_log(np.log(p), df)
+
+
+def t_ppf(q, df):
+    """Quantile function: t such that P(T <= t) = q."""
+    return -t_isf(q, df)
+
+
+def _erfc_log(x):
+    # log erfc(x) for x >= 0: log t - x^2 + sum c_j T_j(2t - 1), t = 2 / (2 + x),
+    # summed with Clenshaw's recurrence
+    t = 2 / (2 + x)
+    y2 = 4 * t - 2
+    d = dd = 0.0
+    for c in _ERFC_CHEB[:0:-1]:
+        d, dd = y2 * d - dd + c, d
+    return np.log(t) - x * x + (0.5 * y2 * d - dd + _ERFC_CHEB[0])
+
+
+def norm_logsf(z):
+    """log P(Z > z) for the standard normal."""
+    z = np.asarray(z, dtype=float)
+    flat = z.ravel()
+    upper = _erfc_log(np.abs(flat) / np.sqrt(2)) + _LOG_HALF
+    result = np.where(flat >= 0, upper, np.log1p(-np.exp(upper))).reshape(z.shape)
+    return result[()] if result.ndim == 0 else result
+
+
+def norm_isf_log(log_p):
+    """Upper normal quantile from the log of the tail probability."""
+    log_p = np.asarray(log_p, dtype=float)
+    flip = log_p > _LOG_HALF
+    log_q = np.where(flip, np.log(-np.expm1(log_p)), log_p)
+    # Acklam's start (relative error ~1e-9, ~2e-5 far below 1e-300) and one
+    # Halley step on log sf, whose hazard rate h obeys h' = h (h - z)
+    with np.errstate(invalid="ignore"):
+        z = -_norm_ppf_lower_start(log_q)
+    log_sf = norm_logsf(z)
+    hazard = np.exp(-0.5 * z * z - _HALF_LOG_2PI - log_sf)
+    step = (log_sf - log_q) / hazard
+    z = z + step / (1 + step * (hazard - z) / 2)
+    z = np.where(log_q == _LOG_HALF, 0.0, np.where(np.isneginf(log_q), np.inf, z))
+    result = np.where(flip, -z, z)
+    return result[()] if result.ndim == 0 else result
+
+
+def norm_isf(p):
+    with np.errstate(divide="ignore"):
+        return norm_isf_log(np.log(p))
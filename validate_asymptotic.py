@@ -0,0 +1,61 @@
+import sys
+
+import numpy as np
+
+import r_critical
+from r_critical import ASYMPTOTIC_DF_THRESHOLD, ASYMPTOTIC_MIN_TAIL_PROB, calculate_r_critical_batch
+
+# Checks the documented error bound of engine="asymptotic": |error in r_crit|
+# below MAX_R_ERROR for df >= ASYMPTOTIC_DF_THRESHOLD and tail probabilities
+# >= ASYMPTOTIC_MIN_TAIL_PROB. The reference is scipy.stats.t.isf; the exact
+# NumPy engine is held to the same bound so the comparison also covers it.
+# Exits non-zero if either engine is off.
+#
+#   python validate_asymptotic.py [size] [seed]
+
+MAX_R_ERROR = 1e-13
+
+
+def validate(size=200_000, seed=0):
+    from scipy import stats
+
+    rng = np.random.default_rng(seed)
+    n = np.round(10 ** rng.uniform(np.log10(ASYMPTOTIC_DF_THRESHOLD + 2), 12, size))
+    tail_prob = 10 ** rng.uniform(np.log10(ASYMPTOTIC_MIN_TAIL_PROB), np.log10(0.5), size)
+    one_tailed = rng.random(size) < 0.5
+    # The worst corner of the domain, for both tail types
+    n[:2] = ASYMPTOTIC_DF_THRESHOLD + 2
+    tail_prob[:2] = ASYMPTOTIC_MIN_TAIL_PROB
+    one_tailed[:2] = True, False
+    df = n - 2
+    alpha = np.where(one_tailed, tail_prob, 2 * tail_prob)
+    tail_type = np.where(one_tailed, "1-tailed", "2-tailed")
+    t_ref = stats.t.isf(tail_prob, df)
+    r_ref = t_ref / np.sqrt(t_ref**2 + df)
+
+    print(f"{size} draws, df in [{ASYMPTOTIC_DF_THRESHOLD}, 1e12], tail probabilities in "
+          f"[{ASYMPTOTIC_MIN_TAIL_PROB:g}, 0.5]")
+    previous = r_critical.get_t_backend()
+    r_critical.set_t_backend("numpy")
+    try:
+        results = {engine: calculate_r_critical_batch(alpha, n, tail_type, engine=engine)[0]
+                   for engine in r_critical.ENGINES}
+    finally:
+        r_critical.set_t_backend(previous)
+
+    failed = []
+    for engine, r_crit in results.items():
+        error = np.abs(r_crit - r_ref)
+        worst = int(np.argmax(error))
+        print(f"  engine={engine:12s} max |r_crit - scipy| {error[worst]:.2e}"
+              f"  (n = {n[worst]:.0f}, tail probability {tail_prob[worst]:.2e})")
+        if not error[worst] < MAX_R_ERROR:
+            failed.append(engine)
+    if failed:
+        print(f"FAILED (bound {MAX_R_ERROR:g}): {', '.join(failed)}")
+    return not failed
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    sys.exit(0 if validate(*args) else 1)
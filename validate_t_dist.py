@@ -0,0 +1,73 @@
+import sys
+
+import numpy as np
+
+import t_dist
+
+# Compares the NumPy-only t_dist module against scipy.stats, which it
+# replaces, on random df and probabilities, and exits non-zero if any
+# relative error exceeds TOLERANCE. Log probabilities are compared by their
+# absolute error (the relative error of the probability) where |log p| < 1.
+#
+#   python validate_t_dist.py [size] [seed]
+#
+# df runs from 1 to 1e12, a third of the draws being small integers. Tail
+# probabilities go down to 1e-100 only: below that scipy's own t.isf breaks
+# down at small df (a factor of 2 off at df = 2, p = 1e-138), so it cannot
+# serve as the reference there. For the same reason the pdf is only compared
+# for df < 1000, where scipy.stats.t.pdf itself is accurate to ~1e-12.
+#
+# Even so scipy is only good to ~1e-12 in places (t.sf(-2.185e-5, 1) is 1e-12
+# off the closed form 1/2 + atan(2.185e-5) / pi, which t_dist matches), so
+# the tolerance leaves room for the reference's own error. Single-value calls
+# take a separate plain-float path, so the first 2000 quantiles are also
+# computed one at a time.
+TOLERANCE = 2e-12
+
+
+def _rel_error(got, ref):
+    return np.abs(got - ref) / np.maximum(np.abs(ref), 1e-300)
+
+
+def _log_error(got, ref):
+    return np.abs(got - ref) / np.maximum(np.abs(ref), 1.0)
+
+
+def validate(size=200_000, seed=0):
+    from scipy import stats
+
+    rng = np.random.default_rng(seed)
+    df = np.where(rng.random(size) < 1 / 3, rng.integers(1, 30, size), 10 ** rng.uniform(0, 12, size))
+    p = 10 ** -rng.uniform(np.log10(1 / 0.4), 100, size)
+    x = rng.normal(0, 4, size)
+    t_ref = stats.t.isf(p, df)
+    small_df = df < 1000
+
+    checks = {
+        "t_isf": (lambda: t_dist.t_isf(p, df), t_ref, _rel_error),
+        "t_isf, one value per call": (lambda: np.array([t_dist.t_isf(pi, di) for pi, di in zip(p[:2000], df[:2000])]),
+                                      t_ref[:2000], _rel_error),
+        "t_logsf at the quantiles": (lambda: t_dist.t_logsf(t_ref, df), stats.t.logsf(t_ref, df), _log_error),
+        "t_sf": (lambda: t_dist.t_sf(x, df), stats.t.sf(x, df), _rel_error),
+        "t_cdf": (lambda: t_dist.t_cdf(x, df), stats.t.cdf(x, df), _rel_error),
+        "t_pdf (df < 1000)": (lambda: t_dist.t_pdf(x[small_df], df[small_df]),
+                              stats.t.pdf(x[small_df], df[small_df]), _rel_error),
+        "norm_isf": (lambda: t_dist.norm_isf(p), stats.norm.isf(p), _rel_error),
+        "norm_logsf": (lambda: t_dist.norm_logsf(5 * x), stats.norm.logsf(5 * x), _log_error),
+    }
+    print(f"{size} draws, df in [1, 1e12], tail probabilities in [1e-100, 0.4]")
+    failed = []
+    for name, (func, ref, measure) in checks.items():
+        error = measure(func(), ref)
+        worst = int(np.argmax(error))
+        print(f"  {name:28s} max error {error[worst]:.2e}")
+        if not error[worst] <= TOLERANCE:
+            failed.append(name)
+    if failed:
+        print(f"FAILED (tolerance {TOLERANCE:g}): {', '.join(failed)}")
+    return not failed
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    sys.exit(0 if validate(*args) else 1)